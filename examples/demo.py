@@ -3,15 +3,15 @@ Demo script for Pain Point to Solution Agent
 Example usage of agent with real-world pain points
 """
 
-import json
 import sys
 from pathlib import Path
 
-# Add src to path to import modules
-sys.path.append(str(Path(__file__).parent.parent / "src"))
+import orjson
 
-from agent import PainPointAgent
-from models import PainPointInput
+# Put the checkout's src first, so its modules win over installed ones
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from agent import get_agent
 
 def main():
     print("🎯 FILUM.AI PAIN POINT TO SOLUTION AGENT DEMO")
@@ -105,10 +105,10 @@ def main():
             }
         },
         {
-            "name": "Retail: Don\'t understand customer behavior",
+            "name": "Retail: Don't understand customer behavior",
             "data": {
                 "pain_point": {
-                    "description": "We have sales data but don\'t understand why customers buy this product and not others. We lack insights to improve products.",
+                    "description": "We have sales data but don't understand why customers buy this product and not others. We lack insights to improve products.",
                     "context": {
                         "industry": "Retail",
                         "company_size": "medium",
@@ -136,7 +136,7 @@ def main():
             "name": "Healthcare: Ineffective feedback collection",
             "data": {
                 "pain_point": {
-                    "description": "The hospital needs to collect patient satisfaction but the current process is very manual and doesn\'t capture complete insights.",
+                    "description": "The hospital needs to collect patient satisfaction but the current process is very manual and doesn't capture complete insights.",
                     "context": {
                         "industry": "Healthcare",
                         "company_size": "large",
@@ -170,55 +170,70 @@ def main():
         return
     
     print("🤖 Initializing Pain Point Agent...")
-    agent = PainPointAgent(str(kb_path))
-    print("✅ Agent initialized successfully!\n")
+    agent = get_agent(str(kb_path))
     
-    # Process each pain point
+    # Collect results to export in a single write after the loop
+    results = []
+    export_path = "analysis_results.jsonl"
+
+    # Each analysis takes well under a millisecond, so pain points are
+    # analyzed in a plain loop; worker processes would cost far more to start
+    # and to load the knowledge base than they save. Each pain point's report
+    # is rendered with a single write
     for i, pain_point in enumerate(pain_points, 1):
-        print(f"📝 Processing Pain Point {i}/{len(pain_points)}: {pain_point[\'name\']}")
-        print("-" * 80)
+        lines = [
+            f"📝 Processing Pain Point {i}/{len(pain_points)}: {pain_point['name']}",
+            "-" * 80,
+        ]
         
         try:
             # Analyze pain point
             result = agent.analyze_and_recommend(pain_point["data"])
             
             # Display results
-            print("📊 ANALYSIS RESULTS:")
-            print(f"   Summary: {result.analysis.pain_point_summary}")
-            print(f"   Impact: {result.analysis.impact_assessment}")
-            print(f"   Key Challenges: {\', \'.join(result.analysis.key_challenges)}")
+            lines.append("📊 ANALYSIS RESULTS:")
+            lines.append(f"   Summary: {result.analysis.pain_point_summary}")
+            lines.append(f"   Impact: {result.analysis.impact_assessment}")
+            lines.append(f"   Key Challenges: {', '.join(result.analysis.key_challenges)}")
             
-            print("\n💡 RECOMMENDED SOLUTIONS:")
-            for i, solution in enumerate(result.recommended_solutions, 1):
-                print(f"   {i}. {solution.solution_name}")
-                print(f"      Relevance: {solution.relevance_score:.1%}")
-                print(f"      Summary: {solution.solution_summary}")
-                print(f"      Implementation: {solution.implementation_guide.complexity} complexity")
-                print()
+            lines.append("\n💡 RECOMMENDED SOLUTIONS:")
+            for j, solution in enumerate(result.recommended_solutions, 1):
+                lines.append(f"   {j}. {solution.solution_name}")
+                lines.append(f"      Relevance: {solution.relevance_score:.1%}")
+                lines.append(f"      Summary: {solution.how_it_helps}")
+                lines.append(f"      Implementation: {solution.complexity_level.value} complexity")
+                lines.append("")
             
-            print("🎯 NEXT STEPS:")
-            print("   Immediate Actions:")
-            for action in result.next_steps.immediate_actions:
-                print(f"   • {action}")
+            lines.append("🎯 NEXT STEPS:")
+            lines.append("   Immediate Actions:")
+            lines.extend(f"   • {action}" for action in result.next_steps.immediate_actions)
             
-            print("   Short-term Goals:")
-            for goal in result.next_steps.short_term_goals:
-                print(f"   • {goal}")
+            lines.append("   Demo Requests:")
+            lines.extend(f"   • {demo_request}" for demo_request in result.next_steps.demo_requests)
             
-            # Export analysis
-            export_path = f"analysis_results_{pain_point[\'name\'].lower().replace(\': \', \'_\').replace(\' \', \'_\')}.json"
-            agent.export_analysis_report(result, export_path, format="json")
-            print(f"\n📄 EXPORTED ANALYSIS TO: {export_path}")
+            results.append((pain_point["name"], result))
             
         except Exception as e:
-            print(f"❌ Error processing pain point: {e}")
+            lines.append(f"❌ Error processing pain point: {e}")
         
-        print("\n" + "=" * 80 + "\n")
+        lines.append("\n" + "=" * 80 + "\n")
+        sys.stdout.write("\n".join(lines) + "\n")
+    
+    # Export all analyses as JSON Lines in one pass
+    with open(export_path, "wb") as f:
+        for name, result in results:
+            f.write(
+                orjson.dumps(
+                    {"name": name, "result": result.model_dump()},
+                    option=orjson.OPT_APPEND_NEWLINE,
+                )
+            )
+    print(f"📄 EXPORTED {len(results)} ANALYSES TO: {export_path}\n")
     
     print("🎉 Demo completed!")
     print("\n📈 Summary:")
     print(f"   Processed {len(pain_points)} pain points")
-    print("   All analysis results exported to JSON files")
+    print(f"   All analysis results exported to {export_path}")
     print("\n🔗 Next steps:")
     print("   1. Review the exported analysis files")
     print("   2. Contact Filum.ai team for implementation support")
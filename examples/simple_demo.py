@@ -3,17 +3,13 @@ Simple demo script for Pain Point Agent
 Does not use relative imports for easy execution
 """
 
-import json
 import sys
 from pathlib import Path
 
-# Add src to Python path
-src_path = Path(__file__).parent.parent / "src"
-sys.path.insert(0, str(src_path))
+# Put the checkout's src first, so its modules win over installed ones
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 
-# Import after adding path
-from models import PainPointInput
-from agent import PainPointAgent
+from agent import get_agent
 
 
 def simple_demo():
@@ -41,7 +37,7 @@ def simple_demo():
     
     try:
         print("🔧 Initializing agent...")
-        agent = PainPointAgent()
+        agent = get_agent()
         print("✅ Agent is ready!")
         print()
         
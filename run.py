@@ -3,13 +3,15 @@ Launcher script for Filum.ai Pain Point Agent
 Solves import issues and provides easy-to-use entry points
 """
 
+import argparse
 import sys
 from pathlib import Path
 
-# Add src to path to import modules
 current_dir = Path(__file__).parent
-src_path = current_dir / "src"
-sys.path.insert(0, str(src_path))
+
+# Put the checkout's src first, so its top-level modules (agent, models,
+# utils, cli) win over any installed module with the same name
+sys.path.insert(0, str(current_dir / "src"))
 
 
 def run_demo():
@@ -18,40 +20,35 @@ def run_demo():
     simple_demo()
 
 
-def run_cli():
+def run_cli(cli_args=None):
     """Run CLI interface"""
-    from cli import main
-    main()
+    from cli import app
+    app(args=cli_args, prog_name="run.py cli")
 
 
 def run_web_server(host="127.0.0.1", port=8000, reload=False):
     """Run web server interface"""
-    import subprocess
-    import sys
-    
-    cmd = [
-        sys.executable, 
-        "web/server.py", 
-        "--host", host, 
-        "--port", str(port)
-    ]
-    
-    if reload:
-        cmd.append("--reload")
+    try:
+        import uvicorn
+    except ImportError:
+        print("❌ Web dependencies are missing. Install them with:")
+        print("pip install -r requirements.txt")
+        return
     
     print(f"🚀 Starting web server at http://{host}:{port}")
     print("Press Ctrl+C to stop the server")
     
+    # Serve in this process; import string lets uvicorn reload the app
+    sys.path.insert(0, str(current_dir))
+    
     try:
-        subprocess.run(cmd, cwd=current_dir)
+        uvicorn.run("web.app:app", host=host, port=port, reload=reload)
     except KeyboardInterrupt:
         print("\n👋 Server stopped by user")
 
 
 def run_analysis(input_file=None, interactive=False):
     """Run analysis with options"""
-    from agent import PainPointAgent
-    
     if interactive:
         # Simple interactive mode
         description = input("Enter pain point description: ")
@@ -70,15 +67,16 @@ def run_analysis(input_file=None, interactive=False):
             }
         }
     elif input_file:
-        import json
-        with open(input_file, 'r', encoding='utf-8') as f:
-            pain_point = json.load(f)
+        import orjson
+        with open(input_file, 'rb') as f:
+            pain_point = orjson.loads(f.read())
     else:
         print("Need to provide input_file or use interactive=True")
         return
     
-    # Run analysis
-    agent = PainPointAgent()
+    # Run analysis; the agent is imported on first use, after input is read
+    from agent import get_agent
+    agent = get_agent()
     result = agent.analyze_and_recommend(pain_point)
     
     # Display results
@@ -90,45 +88,51 @@ def run_analysis(input_file=None, interactive=False):
         print(f"   {sol.how_it_helps}")
 
 
+def build_parser():
+    """Build command line parser for launcher commands"""
+    parser = argparse.ArgumentParser(
+        description="🎯 Filum.ai Pain Point Agent",
+        epilog="Example: python run.py web --host 0.0.0.0 --port 8000 --reload",
+    )
+    subparsers = parser.add_subparsers(dest="command")
+
+    subparsers.add_parser("demo", help="Run demo")
+
+    cli_parser = subparsers.add_parser("cli", help="Run CLI interface")
+    cli_parser.add_argument(
+        "cli_args", nargs=argparse.REMAINDER, help="Arguments passed to the CLI"
+    )
+
+    web_parser = subparsers.add_parser(
+        "web", help="Run web server (localhost:8000)"
+    )
+    web_parser.add_argument("--host", default="127.0.0.1", help="Host to bind")
+    web_parser.add_argument("--port", type=int, default=8000, help="Port to bind")
+    web_parser.add_argument(
+        "--reload", action="store_true", help="Enable auto-reload"
+    )
+
+    subparsers.add_parser("analyze", help="Interactive analysis")
+
+    file_parser = subparsers.add_parser("file", help="Analyze from file")
+    file_parser.add_argument("path", help="Path to pain point JSON file")
+
+    return parser
+
+
 if __name__ == "__main__":
-    if len(sys.argv) == 1:
-        print("🎯 Filum.ai Pain Point Agent")
-        print("\nUsage:")
-        print("  python run.py demo              - Run demo")
-        print("  python run.py cli               - Run CLI interface")
-        print("  python run.py web               - Run web server (localhost:8000)")
-        print("  python run.py web --host HOST --port PORT --reload")
-        print("  python run.py analyze           - Interactive analysis")
-        print("  python run.py file <path>       - Analyze from file")
-        
-    elif sys.argv[1] == "demo":
+    parser = build_parser()
+    args = parser.parse_args()
+
+    if args.command == "demo":
         run_demo()
-    elif sys.argv[1] == "cli":
-        run_cli()
-    elif sys.argv[1] == "web":
-        # Parse web server arguments
-        host = "127.0.0.1"
-        port = 8000
-        reload = False
-        
-        i = 2
-        while i < len(sys.argv):
-            if sys.argv[i] == "--host" and i + 1 < len(sys.argv):
-                host = sys.argv[i + 1]
-                i += 2
-            elif sys.argv[i] == "--port" and i + 1 < len(sys.argv):
-                port = int(sys.argv[i + 1])
-                i += 2
-            elif sys.argv[i] == "--reload":
-                reload = True
-                i += 1
-            else:
-                i += 1
-        
-        run_web_server(host, port, reload)
-    elif sys.argv[1] == "analyze":
+    elif args.command == "cli":
+        run_cli(args.cli_args)
+    elif args.command == "web":
+        run_web_server(args.host, args.port, args.reload)
+    elif args.command == "analyze":
         run_analysis(interactive=True)
-    elif sys.argv[1] == "file" and len(sys.argv) > 2:
-        run_analysis(input_file=sys.argv[2])
+    elif args.command == "file":
+        run_analysis(input_file=args.path)
     else:
-        print("Invalid command. Use: demo, cli, web, analyze, or file <path>")
+        parser.print_help()
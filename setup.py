@@ -16,6 +16,7 @@ setup(
     long_description_content_type="text/markdown",
     url="https://github.com/filum-ai/pain-point-agent",
     packages=find_packages(where="src"),
+    py_modules=["cli"],
     package_dir={"": "src"},
     classifiers=[
         "Development Status :: 5 - Production/Stable",
@@ -45,7 +46,7 @@ setup(
     },
     entry_points={
         "console_scripts": [
-            "filum-agent=src.cli:main",
+            "filum-agent=cli:main",
         ],
     },
 )
@@ -3,11 +3,25 @@ Pain Point Agent - Main orchestrator class
 Coordinates the entire workflow from input analysis to output generation
 """
 
-from typing import List, Dict, Optional, Union
+from typing import Callable, List, Dict, FrozenSet, Optional, Tuple, Union
+from collections import OrderedDict
+from functools import lru_cache
+import hashlib
 import json
-import os
+import logging
 import re
 from pathlib import Path
+from statistics import fmean
+
+import numpy as np
+import orjson
+
+# RE2 matches simple alternations in linear time without backtracking; use
+# the standard library engine when google-re2 is not installed
+try:
+    import re2 as fast_re
+except ImportError:
+    fast_re = re
 
 from models import (
     PainPointInput,
@@ -16,8 +30,160 @@ from models import (
     AlternativeApproach,
     NextSteps,
     Solution,
+    KnowledgeBaseFeature,
+    ComplexityLevel,
+    UrgencyLevel,
+)
+from matching import MatchingEngine, LARGE_COMPANY_SIZES
+from utils import jaccard_similarities, keyword_set
+
+logger = logging.getLogger(__name__)
+
+# Semantic cache key of a description: its keyword set or its embedding
+DescriptionKey = Union[FrozenSet[str], np.ndarray]
+
+# Knowledge base used when no path is given
+DEFAULT_KNOWLEDGE_BASE_PATH = str(
+    Path(__file__).resolve().parent.parent.parent / "data" / "knowledge_base.json"
+)
+
+# Version of the analysis and matching logic. Results stored across runs,
+# such as the CLI result cache, are keyed on it, so bump it whenever a change
+# alters the output for the same input and knowledge base
+ANALYSIS_VERSION = 1
+
+# Maximum number of entries kept in the semantic result cache
+SEMANTIC_CACHE_SIZE = 256
+
+# Default cosine similarity for reusing a result when descriptions are embedded
+EMBEDDING_CACHE_THRESHOLD = 0.95
+
+# Maximum number of entries kept in the analysis result cache
+ANALYSIS_CACHE_SIZE = 512
+
+# Maximum number of items reported in each section of the output
+MAX_CHALLENGES = 4
+MAX_ALTERNATIVES = 2
+MAX_IMMEDIATE_ACTIONS = 4
+
+# Impact statement for each urgency level
+URGENCY_IMPACTS = {
+    UrgencyLevel.HIGH: "Serious impact, needs immediate resolution",
+    UrgencyLevel.MEDIUM: "Significant impact, needs to be addressed soon",
+    UrgencyLevel.LOW: "Limited impact, can be planned for long-term",
+}
+
+# Numeric weight of each complexity level, used to average solution complexity
+COMPLEXITY_WEIGHTS = {
+    ComplexityLevel.LOW: 1,
+    ComplexityLevel.MEDIUM: 2,
+    ComplexityLevel.HIGH: 3,
+}
+
+# Challenge patterns and corresponding challenges
+CHALLENGE_PATTERNS = (
+    (r"difficulty|struggle|hard|challenging", "Difficulty implementing current processes"),
+    (r"no idea|unclear|lack of visibility|unknown", "Lack of visibility and necessary information"),
+    (r"overload|overwhelm|too much|burden", "Work and resource overload"),
+    (r"slow|delay|late|sluggish", "Slow processing and response times"),
+    (r"manual|time-consuming|labor intensive", "Time-consuming manual processes"),
+    (r"inconsistent|variation|different", "Lack of consistency in processes"),
+    (r"low rate|poor performance|inefficient", "Low performance and success rates"),
+)
+
+# All challenge patterns fused into one regex scanned in a single pass. Each
+# challenge is a named group inside a zero-width lookahead, so matches of
+# different challenges may overlap (e.g. "slow rate" finds "slow" and "low rate")
+CHALLENGE_REGEX = re.compile(
+    "(?="
+    + "|".join(
+        f"(?P<challenge_{i}>{pattern})"
+        for i, (pattern, _) in enumerate(CHALLENGE_PATTERNS)
+    )
+    + ")"
+)
+
+# Challenge for each named group, in pattern order
+CHALLENGE_GROUPS = {
+    f"challenge_{i}": challenge
+    for i, (_, challenge) in enumerate(CHALLENGE_PATTERNS)
+}
+
+# Words that mark a response time as not meeting requirements
+SLOW_RESPONSE_PATTERN = fast_re.compile(r"slow|high")
+
+# Words that suggest internal process improvement is an option
+PROCESS_PATTERN = fast_re.compile(r"manual|process")
+
+# Alternative approaches are static, so each is built once and shared
+INTERNAL_PROCESS_ALTERNATIVE = AlternativeApproach(
+    approach_name="Improve Internal Processes",
+    description="Optimize current processes through training and process redesign",
+    pros_cons={
+        "pros": [
+            "Lower cost",
+            "Use existing resources",
+            "Full control over processes",
+        ],
+        "cons": [
+            "Takes long time to see results",
+            "Depends on team discipline",
+            "Difficult to scale as business grows",
+        ],
+    },
+)
+
+THIRD_PARTY_ALTERNATIVE = AlternativeApproach(
+    approach_name="Use Third-Party Tools",
+    description="Integrate specialized tools from different vendors",
+    pros_cons={
+        "pros": [
+            "Many options available in market",
+            "Can find specialized tools",
+            "Flexible to change",
+        ],
+        "cons": [
+            "Difficult integration between tools",
+            "Data silos and fragmentation",
+            "High integration costs",
+        ],
+    },
+)
+
+IN_HOUSE_ALTERNATIVE = AlternativeApproach(
+    approach_name="Develop In-House Solution",
+    description="Build custom system with internal development team",
+    pros_cons={
+        "pros": [
+            "Complete customization",
+            "Full ownership of source code",
+            "Can adapt to business changes",
+        ],
+        "cons": [
+            "High development cost and time",
+            "Need specialized technical team",
+            "Long-term maintenance and support",
+        ],
+    },
+)
+
+# Actions recommended for every pain point
+DEFAULT_IMMEDIATE_ACTIONS = (
+    "Detailed evaluation of recommended solutions",
+    "Determine budget and timeline for project",
+    "Identify key stakeholders to participate in decision making",
 )
-from matching import MatchingEngine
+
+
+@lru_cache(maxsize=8)
+def _load_matching_engine(knowledge_base_path: str) -> MatchingEngine:
+    """
+    Load the matching engine for a knowledge base once per process
+
+    Agents built for the same path share the engine, which is treated as
+    read-only after loading. Failed loads raise and are not cached.
+    """
+    return MatchingEngine(knowledge_base_path)
 
 
 class PainPointAgent:
@@ -25,22 +191,68 @@ class PainPointAgent:
     Main agent class to analyze pain points and recommend solutions
     """
 
-    def __init__(self, knowledge_base_path: Optional[str] = None):
+    __slots__ = (
+        "_log",
+        "matching_engine",
+        "_feature_by_id",
+        "_feature_summaries",
+        "_analysis_cache",
+        "semantic_cache_threshold",
+        "embedder",
+        "_semantic_cache",
+    )
+
+    def __init__(
+        self,
+        knowledge_base_path: Optional[str] = None,
+        semantic_cache_threshold: Optional[float] = None,
+        verbose: bool = False,
+        embedder: Optional[Callable[[str], np.ndarray]] = None,
+    ):
         """
         Initialize Pain Point Agent
 
         Args:
             knowledge_base_path: Path to knowledge base file
+            semantic_cache_threshold: Similarity (0-1) above which a previous
+                result is reused for a near-duplicate description: keyword
+                overlap, or embedding cosine similarity with an embedder.
+                Disabled when None, unless an embedder is given.
+            verbose: Log progress messages at INFO instead of DEBUG level
+            embedder: Optional function mapping a description to an embedding
+                vector; enables the semantic cache with a default threshold
+                of EMBEDDING_CACHE_THRESHOLD
         """
-        # Use default knowledge base if not provided
+        # Progress messages are only formatted when the level is enabled
+        self._log = logger.info if verbose else logger.debug
+
+        # Use default knowledge base if not provided. Other paths are made
+        # absolute so relative spellings of one file share a loaded engine
         if knowledge_base_path is None:
-            current_dir = Path(__file__).parent.parent.parent
-            knowledge_base_path = current_dir / "data" / "knowledge_base.json"
+            knowledge_base_path = DEFAULT_KNOWLEDGE_BASE_PATH
+        else:
+            knowledge_base_path = str(Path(knowledge_base_path).resolve())
 
-        self.matching_engine = MatchingEngine(str(knowledge_base_path))
+        self.matching_engine = _load_matching_engine(knowledge_base_path)
+
+        # Features by ID and the feature summary list, built from the loaded
+        # knowledge base (rebuild both if the knowledge base is reloaded)
+        self._feature_by_id: Dict[str, KnowledgeBaseFeature] = {
+            feature.feature_id: feature
+            for feature in self.matching_engine.features or []
+        }
+        self._feature_summaries: Optional[List[Dict[str, str]]] = None
 
-        # Cache for performance
-        self._analysis_cache: Dict[str, PainPointAnalysis] = {}
+        # Cache for performance: input hash -> result, in LRU order
+        self._analysis_cache: "OrderedDict[bytes, AgentOutput]" = OrderedDict()
+
+        # Semantic cache: (context signature, description key, result), where
+        # the description key is its keyword set or unit-length embedding
+        if embedder is not None and semantic_cache_threshold is None:
+            semantic_cache_threshold = EMBEDDING_CACHE_THRESHOLD
+        self.semantic_cache_threshold = semantic_cache_threshold
+        self.embedder = embedder
+        self._semantic_cache: List[Tuple[str, DescriptionKey, AgentOutput]] = []
 
     # def analyze_and_recommend(
     #     self, pain_point_input: Dict | PainPointInput, max_solutions: int = 3
@@ -65,18 +277,38 @@ class PainPointAgent:
         else:
             pain_point = pain_point_input
 
-        print("🔍 Starting pain point analysis...")
+        # Return previous result for identical input
+        cache_key = self._analysis_cache_key(pain_point, max_solutions)
+        cached = self._analysis_cache.get(cache_key)
+        if cached is not None:
+            self._analysis_cache.move_to_end(cache_key)
+            return cached
+
+        # Reuse result of a near-duplicate pain point if semantic cache is enabled
+        cache_entry = None
+        if self.semantic_cache_threshold is not None:
+            cache_entry = self._semantic_cache_key(pain_point, max_solutions)
+            cached = self._semantic_cache_lookup(*cache_entry)
+            if cached is not None:
+                self._analysis_cache_store(cache_key, cached)
+                return cached
+
+        self._log("Starting pain point analysis")
 
         # Step 1: Analyze pain point
         analysis = self._analyze_pain_point(pain_point)
-        print("✅ Completed pain point analysis")
+        self._log("Completed pain point analysis")
 
         # Step 2: Find matching solutions
-        print("🎯 Searching for matching solutions...")
+        self._log("Searching for matching solutions")
         solutions = self.matching_engine.find_matching_solutions(
             pain_point, max_solutions
         )
-        print(f"✅ Found {len(solutions)} matching solutions")
+        self._log("Found %d matching solutions", len(solutions))
+
+        # Steps 3 and 4 are independent, but both are a few microseconds of
+        # pure Python; handing them to a thread pool costs more than it saves
+        # under the GIL, so they run sequentially
 
         # Step 3: Generate alternative approaches
         alternatives = self._generate_alternatives(pain_point, solutions)
@@ -84,82 +316,223 @@ class PainPointAgent:
         # Step 4: Generate next steps
         next_steps = self._generate_next_steps(pain_point, solutions)
 
-        return AgentOutput(
+        output = AgentOutput.trusted(
             analysis=analysis,
             recommended_solutions=solutions,
             alternative_approaches=alternatives,
             next_steps=next_steps,
         )
 
-    def _analyze_pain_point(self, pain_point: PainPointInput) -> PainPointAnalysis:
+        if cache_entry is not None:
+            self._semantic_cache_store(*cache_entry, output)
+        self._analysis_cache_store(cache_key, output)
+
+        return output
+
+    def analyze_batch(
+        self,
+        pain_point_inputs: List[Union[Dict, PainPointInput]],
+        max_solutions: int = 3,
+    ) -> List[AgentOutput]:
         """
-        Analysis and summarize pain point
+        Analyze several pain points, matching solutions for all in one pass
 
         Args:
-            pain_point: Input pain point
+            pain_point_inputs: Input data from user (dicts or PainPointInput objects)
+            max_solutions: Maximum number of solutions per pain point
 
         Returns:
-            PainPointAnalysis object
+            AgentOutput for each input, in the same order
+        """
+        pain_points = [
+            PainPointInput(**pain_point_input)
+            if isinstance(pain_point_input, dict)
+            else pain_point_input
+            for pain_point_input in pain_point_inputs
+        ]
+
+        solutions_batch = self.matching_engine.find_matching_solutions_batch(
+            pain_points, max_solutions
+        )
+
+        return [
+            AgentOutput.trusted(
+                analysis=self._analyze_pain_point(pain_point),
+                recommended_solutions=solutions,
+                alternative_approaches=self._generate_alternatives(
+                    pain_point, solutions
+                ),
+                next_steps=self._generate_next_steps(pain_point, solutions),
+            )
+            for pain_point, solutions in zip(pain_points, solutions_batch)
+        ]
+
+    def _analysis_cache_key(
+        self, pain_point: PainPointInput, max_solutions: int
+    ) -> bytes:
+        """
+        Hash validated input and max_solutions into an analysis cache key
+
+        Hashing the validated model rather than the raw input lets dict and
+        PainPointInput inputs with the same content share a cache entry.
+        """
+        payload = orjson.dumps(
+            {"input": pain_point.model_dump(), "max_solutions": max_solutions},
+            option=orjson.OPT_SORT_KEYS,
+            default=str,
+        )
+        return hashlib.blake2b(payload, digest_size=16).digest()
+
+    def _analysis_cache_store(self, key: bytes, output: AgentOutput) -> None:
+        """Store result in analysis cache, evicting least recently used"""
+        self._analysis_cache[key] = output
+        if len(self._analysis_cache) > ANALYSIS_CACHE_SIZE:
+            self._analysis_cache.popitem(last=False)
+
+    def _semantic_cache_key(
+        self, pain_point: PainPointInput, max_solutions: int
+    ) -> Tuple[str, DescriptionKey]:
         """
+        Build semantic cache key for a pain point
+
+        Everything except the description must match exactly (context,
+        affected areas, preferences, max_solutions); the description is
+        compared by keyword overlap, or by embedding if an embedder is set.
+
+        Returns:
+            Tuple of (context signature, description key)
+        """
+        signature = json.dumps(
+            {
+                "input": pain_point.model_dump(
+                    exclude={"pain_point": {"description"}}
+                ),
+                "max_solutions": max_solutions,
+            },
+            sort_keys=True,
+            default=str,
+        )
         description = pain_point.pain_point.description
-        context = pain_point.pain_point.context
-        affected_areas = pain_point.pain_point.affected_areas
-        current_impact = pain_point.pain_point.current_impact
 
-        # Generate summary
-        summary_parts = [f"Main issue: {description}"]
+        if self.embedder is None:
+            return signature, keyword_set(description)
+
+        # Normalize once so cosine similarity is a plain dot product
+        embedding = np.asarray(self.embedder(description), dtype=np.float64)
+        norm = np.linalg.norm(embedding)
+        return signature, embedding / norm if norm else embedding
+
+    def _semantic_cache_lookup(
+        self, signature: str, description_key: DescriptionKey
+    ) -> Optional[AgentOutput]:
+        """Find cached result whose description is similar enough"""
+        candidates = [
+            (cached_key, cached_output)
+            for cached_signature, cached_key, cached_output in self._semantic_cache
+            if cached_signature == signature
+        ]
+        if not candidates:
+            return None
+
+        if self.embedder is not None:
+            # Cosine similarity against all candidates in one matrix product
+            similarities = np.stack([key for key, _ in candidates]) @ description_key
+            best = int(np.argmax(similarities))
+            if similarities[best] >= self.semantic_cache_threshold:
+                return candidates[best][1]
+            return None
+
+        # Jaccard similarity against all candidates at once; on ties the
+        # most recent candidate wins
+        scores = jaccard_similarities(description_key, [key for key, _ in candidates])
+        best = len(scores) - 1 - int(np.argmax(scores[::-1]))
+        if scores[best] >= self.semantic_cache_threshold:
+            return candidates[best][1]
+        return None
 
-        if context and context.industry:
-            summary_parts.append(f"Industry: {context.industry}")
+    def _semantic_cache_store(
+        self, signature: str, description_key: DescriptionKey, output: AgentOutput
+    ) -> None:
+        """Store result in semantic cache, evicting the oldest entry when full"""
+        if len(self._semantic_cache) >= SEMANTIC_CACHE_SIZE:
+            self._semantic_cache.pop(0)
+        self._semantic_cache.append((signature, description_key, output))
 
-        if context and context.company_size:
-            summary_parts.append(f"Scale: {context.company_size.value}")
+    def _analyze_pain_point(self, pain_point: PainPointInput) -> PainPointAnalysis:
+        """
+        Analysis and summarize pain point
+
+        Args:
+            pain_point: Input pain point
+
+        Returns:
+            PainPointAnalysis object
+        """
+        details = pain_point.pain_point
+        description = details.description
+        context = details.context
+        affected_areas = details.affected_areas
+
+        # Generate summary, each optional part with its ". " separator
+        industry = (
+            f". Industry: {context.industry}" if context and context.industry else ""
+        )
+        scale = (
+            f". Scale: {context.company_size.value}"
+            if context and context.company_size
+            else ""
+        )
+        areas = f". Affected areas: {', '.join(affected_areas)}" if affected_areas else ""
 
-        if affected_areas:
-            summary_parts.append(f"Affected areas: {', '.join(affected_areas)}")
+        summary = f"Main issue: {description}{industry}{scale}{areas}"
 
-        summary = ". ".join(summary_parts)
+        # Areas are checked for membership by both helpers, so hash them once
+        area_set = frozenset(affected_areas)
 
         # Identify key challenges
-        challenges = self._extract_key_challenges(pain_point)
+        challenges = self._extract_key_challenges(pain_point, area_set)
 
         # Assess impact
-        impact_assessment = self._assess_impact(pain_point)
+        impact_assessment = self._assess_impact(pain_point, area_set)
 
-        return PainPointAnalysis(
+        return PainPointAnalysis.trusted(
             pain_point_summary=summary,
             key_challenges=challenges,
             impact_assessment=impact_assessment,
         )
 
-    def _extract_key_challenges(self, pain_point: PainPointInput) -> List[str]:
+    def _extract_key_challenges(
+        self,
+        pain_point: PainPointInput,
+        area_set: Optional[FrozenSet[str]] = None,
+    ) -> List[str]:
         """Extract key challenges from pain point description"""
-        description = pain_point.pain_point.description.lower()
-
-        # Challenge patterns and corresponding challenges
-        challenge_patterns = {
-            r"difficulty|struggle|hard|challenging": "Difficulty implementing current processes",
-            r"no idea|unclear|lack of visibility|unknown": "Lack of visibility and necessary information",
-            r"overload|overwhelm|too much|burden": "Work and resource overload",
-            r"slow|delay|late|sluggish": "Slow processing and response times",
-            r"manual|time-consuming|labor intensive": "Time-consuming manual processes",
-            r"inconsistent|variation|different": "Lack of consistency in processes",
-            r"low rate|poor performance|inefficient": "Low performance and success rates",
-        }
+        details = pain_point.pain_point
+        description = details.description.lower()
+        if area_set is None:
+            area_set = frozenset(details.affected_areas)
+
+        # Stop scanning once every challenge has been seen
+        found_groups = set()
+        for match in CHALLENGE_REGEX.finditer(description):
+            found_groups.add(match.lastgroup)
+            if len(found_groups) == len(CHALLENGE_GROUPS):
+                break
 
         challenges = []
-        import re
-
-        for pattern, challenge in challenge_patterns.items():
-            if re.search(pattern, description):
+        for group, challenge in CHALLENGE_GROUPS.items():
+            if group in found_groups:
                 challenges.append(challenge)
+                if len(challenges) == MAX_CHALLENGES:
+                    return challenges
 
         # Add context-based challenges
-        if pain_point.pain_point.affected_areas:
-            if "customer_service" in pain_point.pain_point.affected_areas:
-                challenges.append("Need to improve customer service quality")
-            if "marketing" in pain_point.pain_point.affected_areas:
-                challenges.append("Need to optimize marketing effectiveness")
+        if "customer_service" in area_set:
+            challenges.append("Need to improve customer service quality")
+            if len(challenges) == MAX_CHALLENGES:
+                return challenges
+        if "marketing" in area_set:
+            challenges.append("Need to optimize marketing effectiveness")
 
         # Ensure we have at least some challenges
         if not challenges:
@@ -168,58 +541,55 @@ class PainPointAgent:
                 "Lack of automation and intelligence in workflow",
             ]
 
-        return challenges[:4]  # Limit to 4 challenges
+        return challenges
 
-    def _assess_impact(self, pain_point: PainPointInput) -> str:
+    def _assess_impact(
+        self,
+        pain_point: PainPointInput,
+        area_set: Optional[FrozenSet[str]] = None,
+    ) -> str:
         """Assess the impact level of the pain point"""
-        context = pain_point.pain_point.context
-        current_impact = pain_point.pain_point.current_impact
+        details = pain_point.pain_point
+        context = details.context
+        n_areas = len(details.affected_areas)
+        if area_set is None:
+            area_set = frozenset(details.affected_areas)
+        current_impact = details.current_impact
+        metrics = current_impact.metrics if current_impact else None
 
         impact_factors = []
 
         # Assess urgency
         if context and context.urgency_level:
-            urgency = context.urgency_level.value
-            urgency_map = {
-                "high": "Serious impact, needs immediate resolution",
-                "medium": "Significant impact, needs to be addressed soon",
-                "low": "Limited impact, can be planned for long-term",
-            }
             impact_factors.append(
-                urgency_map.get(urgency, "Impact level needs further assessment")
+                URGENCY_IMPACTS.get(
+                    context.urgency_level, "Impact level needs further assessment"
+                )
             )
 
         # Assess based on affected areas
-        affected_areas = pain_point.pain_point.affected_areas
-        if len(affected_areas) > 2:
+        if n_areas > 2:
             impact_factors.append("Multi-area impact, needs comprehensive solution")
-        elif "customer_service" in affected_areas:
+        elif "customer_service" in area_set:
             impact_factors.append("Directly affects customer experience")
 
         # Assess based on current metrics
-        if current_impact and current_impact.metrics:
-            metrics = current_impact.metrics
-            if (
-                metrics.customer_satisfaction
-                and "low" in str(metrics.customer_satisfaction).lower()
-            ):
+        # Metric fields are validated as strings, so no str() conversion is needed
+        if metrics:
+            satisfaction = metrics.customer_satisfaction
+            if satisfaction and "low" in satisfaction.lower():
                 impact_factors.append(
                     "Customer satisfaction is being negatively affected"
                 )
-            if metrics.response_time and any(
-                word in str(metrics.response_time).lower() for word in ["slow", "high"]
-            ):
+            response_time = metrics.response_time
+            if response_time and SLOW_RESPONSE_PATTERN.search(response_time.lower()):
                 impact_factors.append(
                     "Current response time does not meet requirements"
                 )
 
         # Company size impact
-        if context and context.company_size:
-            size = context.company_size.value
-            if size in ["large", "enterprise"]:
-                impact_factors.append(
-                    "At large scale, impact may affect many customers"
-                )
+        if context and context.company_size in LARGE_COMPANY_SIZES:
+            impact_factors.append("At large scale, impact may affect many customers")
 
         if not impact_factors:
             return "This issue is affecting operational efficiency and needs to be resolved"
@@ -232,99 +602,51 @@ class PainPointAgent:
         """Generate alternative approaches besides Filum.ai solutions"""
         alternatives = []
 
-        description = pain_point.pain_point.description.lower()
+        details = pain_point.pain_point
+        description = details.description.lower()
+        context = details.context
 
         # Alternative 1: Internal process improvement
-        if any(word in description for word in ["manual", "process"]):
-            alternatives.append(
-                AlternativeApproach(
-                    approach_name="Improve Internal Processes",
-                    description="Optimize current processes through training and process redesign",
-                    pros_cons={
-                        "pros": [
-                            "Lower cost",
-                            "Use existing resources",
-                            "Full control over processes",
-                        ],
-                        "cons": [
-                            "Takes long time to see results",
-                            "Depends on team discipline",
-                            "Difficult to scale as business grows",
-                        ],
-                    },
-                )
-            )
+        if PROCESS_PATTERN.search(description):
+            alternatives.append(INTERNAL_PROCESS_ALTERNATIVE)
 
         # Alternative 2: Third-party tools
         if len(solutions) > 0:
-            alternatives.append(
-                AlternativeApproach(
-                    approach_name="Use Third-Party Tools",
-                    description="Integrate specialized tools from different vendors",
-                    pros_cons={
-                        "pros": [
-                            "Many options available in market",
-                            "Can find specialized tools",
-                            "Flexible to change",
-                        ],
-                        "cons": [
-                            "Difficult integration between tools",
-                            "Data silos and fragmentation",
-                            "High integration costs",
-                        ],
-                    },
-                )
-            )
+            alternatives.append(THIRD_PARTY_ALTERNATIVE)
 
-        # Alternative 3: Build in-house
-        if pain_point.pain_point.context and pain_point.pain_point.context.company_size:
-            size = pain_point.pain_point.context.company_size.value
-            if size in ["large", "enterprise"]:
-                alternatives.append(
-                    AlternativeApproach(
-                        approach_name="Develop In-House Solution",
-                        description="Build custom system with internal development team",
-                        pros_cons={
-                            "pros": [
-                                "Complete customization",
-                                "Full ownership of source code",
-                                "Can adapt to business changes",
-                            ],
-                            "cons": [
-                                "High development cost and time",
-                                "Need specialized technical team",
-                                "Long-term maintenance and support",
-                            ],
-                        },
-                    )
-                )
+        # Alternative 3: Build in-house, only if there is still room
+        if (
+            len(alternatives) < MAX_ALTERNATIVES
+            and context
+            and context.company_size in LARGE_COMPANY_SIZES
+        ):
+            alternatives.append(IN_HOUSE_ALTERNATIVE)
 
-        return alternatives[:2]  # Limit to 2 alternatives
+        return alternatives
 
     def _generate_next_steps(
         self, pain_point: PainPointInput, solutions: List[Solution]
     ) -> NextSteps:
         """Generate next steps for user"""
-        immediate_actions = [
-            "Detailed evaluation of recommended solutions",
-            "Determine budget and timeline for project",
-            "Identify key stakeholders to participate in decision making",
-        ]
+        context = pain_point.pain_point.context
 
-        # Add specific actions based on context
-        if pain_point.pain_point.context:
-            context = pain_point.pain_point.context
+        # Urgent meeting comes first for high urgency pain points
+        immediate_actions = []
+        if context and context.urgency_level is UrgencyLevel.HIGH:
+            immediate_actions.append("Organize urgent meeting with leadership team")
 
-            if context.urgency_level and context.urgency_level.value == "high":
-                immediate_actions.insert(
-                    0, "Organize urgent meeting with leadership team"
-                )
+        immediate_actions += DEFAULT_IMMEDIATE_ACTIONS
 
-            if not context.current_tools:
-                immediate_actions.append("Audit current tools and systems")
+        # Add specific actions based on context, up to MAX_IMMEDIATE_ACTIONS
+        if (
+            context
+            and not context.current_tools
+            and len(immediate_actions) < MAX_IMMEDIATE_ACTIONS
+        ):
+            immediate_actions.append("Audit current tools and systems")
 
         # Add solution-specific actions
-        if solutions:
+        if solutions and len(immediate_actions) < MAX_IMMEDIATE_ACTIONS:
             top_solution = solutions[0]
             immediate_actions.append(
                 f"Learn more about {top_solution.solution_name} (relevance score: {top_solution.relevance_score})"
@@ -333,14 +655,9 @@ class PainPointAgent:
         # Determine if consultation needed
         consultation_needed = True
         if solutions and len(solutions) > 0:
-            avg_complexity = sum(
-                (
-                    1
-                    if sol.complexity_level.value == "low"
-                    else 2 if sol.complexity_level.value == "medium" else 3
-                )
-                for sol in solutions
-            ) / len(solutions)
+            avg_complexity = fmean(
+                COMPLEXITY_WEIGHTS[sol.complexity_level] for sol in solutions
+            )
             consultation_needed = avg_complexity > 1.5
 
         # Generate demo requests
@@ -349,7 +666,7 @@ class PainPointAgent:
             demo_requests.append(f"Demo {solution.solution_name}")
 
         return NextSteps(
-            immediate_actions=immediate_actions[:4],  # Limit to 4 actions
+            immediate_actions=immediate_actions,
             consultation_needed=consultation_needed,
             demo_requests=demo_requests,
         )
@@ -364,34 +681,29 @@ class PainPointAgent:
         Returns:
             Dictionary chứa thông tin chi tiết feature
         """
-        if not self.matching_engine.features:
-            return None
-
-        for feature in self.matching_engine.features:
-            if feature.feature_id == feature_id:
-                return feature.dict()
-
-        return None
+        feature = self._feature_by_id.get(feature_id)
+        return feature.model_dump() if feature else None
 
     def list_available_features(self) -> List[Dict[str, str]]:
         """
         List all features available in knowledge base
 
         Returns:
-            List of dictionaries with basic feature information
+            List of dictionaries with basic feature information (shared
+            between calls, do not modify)
         """
-        if not self.matching_engine.features:
-            return []
+        if self._feature_summaries is None:
+            self._feature_summaries = [
+                {
+                    "feature_id": feature.feature_id,
+                    "feature_name": feature.feature_name,
+                    "category": feature.category.value,
+                    "description": feature.description.short,
+                }
+                for feature in self.matching_engine.features or []
+            ]
 
-        return [
-            {
-                "feature_id": feature.feature_id,
-                "feature_name": feature.feature_name,
-                "category": feature.category.value,
-                "description": feature.description.short,
-            }
-            for feature in self.matching_engine.features
-        ]
+        return self._feature_summaries
 
     def export_analysis_report(
         self, output: AgentOutput, file_path: str, format: str = "json"
@@ -405,8 +717,9 @@ class PainPointAgent:
             format: Định dạng file ("json" hoặc "markdown")
         """
         if format.lower() == "json":
-            with open(file_path, "w", encoding="utf-8") as f:
-                json.dump(output.dict(), f, ensure_ascii=False, indent=2)
+            # Serialize straight from the model, skipping the dict copy
+            with open(file_path, "wb") as f:
+                f.write(output.model_dump_json(indent=2).encode("utf-8"))
         elif format.lower() == "markdown":
             self._export_markdown_report(output, file_path)
         else:
@@ -414,46 +727,79 @@ class PainPointAgent:
                 "Format not supported. Only 'json' and 'markdown' are supported"
             )
 
-        print(f"✅ Đã export report ra {file_path}")
+        self._log("Exported report to %s", file_path)
 
     def _export_markdown_report(self, output: AgentOutput, file_path: str) -> None:
         """Export report as Markdown"""
-        with open(file_path, "w", encoding="utf-8") as f:
-            f.write("# Pain Point Analysis Report\n\n")
-
-            # Analysis section
-            f.write("## Pain Point Analysis\n\n")
-            f.write(f"**Summary:** {output.analysis.pain_point_summary}\n\n")
-            f.write(f"**Impact Assessment:** {output.analysis.impact_assessment}\n\n")
-
-            f.write("**Key Challenges:**\n")
-            for challenge in output.analysis.key_challenges:
-                f.write(f"- {challenge}\n")
-            f.write("\n")
-
-            # Solutions section
-            f.write("## Recommended Solutions\n\n")
-            for i, solution in enumerate(output.recommended_solutions, 1):
-                f.write(f"### {i}. {solution.solution_name}\n\n")
-                f.write(f"**Matching Score:** {solution.relevance_score}/1.0\n\n")
-                f.write(f"**How it helps:** {solution.how_it_helps}\n\n")
-
-                f.write("**Implementation Steps:**\n")
-                for step in solution.implementation_steps:
-                    f.write(f"1. {step}\n")
-                f.write("\n")
-
-                if solution.expected_outcomes.short_term:
-                    f.write("**Short-term Results:**\n")
-                    for outcome in solution.expected_outcomes.short_term:
-                        f.write(f"- {outcome}\n")
-                    f.write("\n")
-
-            # Next steps
-            if output.next_steps:
-                f.write("## Next Steps\n\n")
-                for action in output.next_steps.immediate_actions:
-                    f.write(f"- {action}\n")
-                f.write("\n")
-
-        print(f"✅ Markdown report generated: {file_path}")
+        export_markdown_report(output, file_path)
+
+        self._log("Markdown report generated: %s", file_path)
+
+
+def export_markdown_report(output: AgentOutput, file_path: str) -> None:
+    """
+    Export an analysis result as a Markdown report
+
+    Needs no agent, so results loaded from elsewhere (such as the CLI result
+    cache) can be exported without loading a knowledge base.
+
+    Args:
+        output: AgentOutput from analyze_and_recommend
+        file_path: Output file path
+    """
+    analysis = output.analysis
+    parts = [
+        "# Pain Point Analysis Report\n\n",
+        # Analysis section
+        "## Pain Point Analysis\n\n",
+        f"**Summary:** {analysis.pain_point_summary}\n\n",
+        f"**Impact Assessment:** {analysis.impact_assessment}\n\n",
+        "**Key Challenges:**\n",
+    ]
+    parts.extend(f"- {challenge}\n" for challenge in analysis.key_challenges)
+    parts.append("\n")
+
+    # Solutions section
+    parts.append("## Recommended Solutions\n\n")
+    for i, solution in enumerate(output.recommended_solutions, 1):
+        parts.append(
+            f"### {i}. {solution.solution_name}\n\n"
+            f"**Matching Score:** {solution.relevance_score}/1.0\n\n"
+            f"**How it helps:** {solution.how_it_helps}\n\n"
+            "**Implementation Steps:**\n"
+        )
+        parts.extend(f"1. {step}\n" for step in solution.implementation_steps)
+        parts.append("\n")
+
+        short_term = solution.expected_outcomes.short_term
+        if short_term:
+            parts.append("**Short-term Results:**\n")
+            parts.extend(f"- {outcome}\n" for outcome in short_term)
+            parts.append("\n")
+
+    # Next steps
+    if output.next_steps:
+        parts.append("## Next Steps\n\n")
+        parts.extend(f"- {action}\n" for action in output.next_steps.immediate_actions)
+        parts.append("\n")
+
+    # Encode the whole document once and write it in a single call
+    with open(file_path, "wb") as f:
+        f.write("".join(parts).encode("utf-8"))
+
+
+@lru_cache(maxsize=4)
+def get_agent(knowledge_base_path: Optional[str] = None) -> PainPointAgent:
+    """
+    Get a shared PainPointAgent for the given knowledge base
+
+    The agent (and its loaded knowledge base) is built once per path and
+    reused by later calls in the same process.
+
+    Args:
+        knowledge_base_path: Path to knowledge base file (default knowledge base if None)
+
+    Returns:
+        Cached PainPointAgent instance
+    """
+    return PainPointAgent(knowledge_base_path)
@@ -2,31 +2,148 @@
 Command Line Interface for Pain Point to Solution Agent
 """
 
+import hashlib
+import os
+import re
 import typer
-import json
+import orjson
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional
-from rich.console import Console
-from rich.table import Table
-from rich.panel import Panel
-from rich.prompt import Prompt, Confirm
-from rich.text import Text
-
-from agent import PainPointAgent
-from models import PainPointInput
-from utils import validate_pain_point_input
-
-# Initialize Typer app and Rich console
+from typing import TYPE_CHECKING, Optional
+
+if TYPE_CHECKING:
+    from models import PainPointInputDict
+
+# Rich and the agent are imported inside the functions that use them, so
+# --help and shell completion only pay for importing Typer
+
+# Initialize Typer app. Without Rich markup, help is rendered as plain
+# text, so --help and shell completion never import Rich
 app = typer.Typer(
     name="filum-agent",
     help="Filum.ai Pain Point to Solution Agent CLI",
     add_completion=False,
+    rich_markup_mode=None,
+    pretty_exceptions_enable=False,
+)
+
+# Feature descriptions longer than this are truncated in the features table
+DESCRIPTION_PREVIEW_LENGTH = 60
+
+# Sample pain points for the demo command
+DEMO_SAMPLES = (
+    {
+        "name": "E-commerce Feedback Collection",
+        "data": {
+            "pain_point": {
+                "description": "We have difficulty collecting customer feedback after they purchase. Currently only about 5% of customers respond to email surveys.",
+                "context": {
+                    "industry": "E-commerce",
+                    "company_size": "medium",
+                    "urgency_level": "high",
+                },
+                "affected_areas": ["customer_service", "marketing"],
+            }
+        },
+    },
+    {
+        "name": "Support Agent Overload",
+        "data": {
+            "pain_point": {
+                "description": "Support agents are overwhelmed by repetitive questions, response time has slowed to an average of 4 hours.",
+                "context": {
+                    "industry": "SaaS",
+                    "company_size": "large",
+                    "urgency_level": "high",
+                },
+                "affected_areas": ["customer_service"],
+            }
+        },
+    },
+)
+
+# Sample numbers accepted by the demo prompt
+DEMO_SAMPLE_CHOICES = tuple(str(i) for i in range(1, len(DEMO_SAMPLES) + 1))
+
+# Choices offered by the interactive input prompts
+COMPANY_SIZE_CHOICES = ("startup", "small", "medium", "large", "enterprise")
+URGENCY_CHOICES = ("low", "medium", "high")
+AFFECTED_AREAS_HELP = "\n".join(
+    f"  - {area}" for area in ("customer_service", "marketing", "sales", "operations")
 )
-console = Console()
+
+# Separator between affected areas typed at the prompt (area names use underscores)
+AREA_SEPARATOR_PATTERN = re.compile(r"[,\s]+")
+
+
+@lru_cache(maxsize=1)
+def _console():
+    """Create the Rich console on first use"""
+    from rich.console import Console
+
+    return Console()
+
+
+def _result_cache_dir() -> Path:
+    """Get the directory holding cached results of the analyze command"""
+    cache_home = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(cache_home) / "filum-agent"
+
+
+def _result_cache_path(
+    pain_point_data: "PainPointInputDict", max_solutions: int, knowledge_base: Optional[str]
+) -> Path:
+    """
+    Get the cache file for an analysis
+
+    The key covers the input, max_solutions, the knowledge base path and
+    modification time and the analysis version, so editing the knowledge base
+    or upgrading to different analysis logic invalidates old results.
+    """
+    from agent import ANALYSIS_VERSION, DEFAULT_KNOWLEDGE_BASE_PATH
+
+    kb_path = Path(knowledge_base or DEFAULT_KNOWLEDGE_BASE_PATH).resolve()
+    payload = orjson.dumps(
+        {
+            "input": pain_point_data,
+            "max_solutions": max_solutions,
+            "knowledge_base": str(kb_path),
+            "knowledge_base_mtime": kb_path.stat().st_mtime_ns,
+            "analysis_version": ANALYSIS_VERSION,
+        },
+        option=orjson.OPT_SORT_KEYS,
+    )
+    digest = hashlib.blake2b(payload, digest_size=16).hexdigest()
+    return _result_cache_dir() / f"{digest}.json"
+
+
+def _load_cached_result(cache_path: Path):
+    """Load a cached analysis result, or None if missing or unreadable"""
+    from models import AgentOutput
+
+    try:
+        return AgentOutput.model_validate_json(cache_path.read_bytes())
+    except (OSError, ValueError):
+        return None
+
+
+def _store_cached_result(cache_path: Path, result) -> None:
+    """Store an analysis result in the cache; failures only skip caching"""
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = cache_path.with_name(cache_path.name + ".tmp")
+        tmp_path.write_bytes(result.model_dump_json().encode("utf-8"))
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        pass
 
 
 def print_header():
     """Print application header"""
+    from rich.panel import Panel
+    from rich.text import Text
+
+    console = _console()
     header_text = Text("🎯 Filum.ai Pain Point to Solution Agent", style="bold blue")
     console.print(Panel(header_text, expand=False))
     console.print()
@@ -34,6 +151,7 @@ def print_header():
 
 @app.command()
 def analyze(
+    ctx: typer.Context,
     input_file: Optional[str] = typer.Option(
         None, "--input", "-i", help="Path to JSON file containing pain point input"
     ),
@@ -49,17 +167,24 @@ def analyze(
     interactive: bool = typer.Option(
         False, "--interactive", "-I", help="Interactive mode to input pain point"
     ),
+    no_cache: bool = typer.Option(
+        False, "--no-cache", help="Ignore and don't store cached analysis results"
+    ),
 ):
     """Analyze pain point and recommend solutions"""
+    # Shell completion only parses arguments; don't import or load the agent
+    if ctx.resilient_parsing:
+        return
+
+    from rich.prompt import Confirm
+
+    from agent import get_agent
+    from utils import validate_pain_point_input
+
+    console = _console()
     print_header()
 
     try:
-        # Initialize agent
-        console.print("🔧 Initializing agent...", style="yellow")
-        agent = PainPointAgent(knowledge_base)
-        console.print("✅ Agent is ready!", style="green")
-        console.print()
-
         # Get input
         if interactive:
             pain_point_data = get_interactive_input()
@@ -79,9 +204,31 @@ def analyze(
                 console.print(f"  - {error}", style="red")
             raise typer.Exit(1)
 
-        # Analyze
-        console.print("🔍 Analyzing pain point...", style="yellow")
-        result = agent.analyze_and_recommend(pain_point_data, max_solutions)
+        # Reuse the result of an earlier run with the same input
+        cache_path = None
+        result = None
+        if not no_cache:
+            cache_path = _result_cache_path(
+                pain_point_data, max_solutions, knowledge_base
+            )
+            result = _load_cached_result(cache_path)
+            if result is not None:
+                console.print("♻️ Using cached analysis result", style="green")
+                console.print()
+
+        if result is None:
+            # Initialize agent
+            console.print("🔧 Initializing agent...", style="yellow")
+            agent = get_agent(knowledge_base)
+            console.print("✅ Agent is ready!", style="green")
+            console.print()
+
+            # Analyze
+            console.print("🔍 Analyzing pain point...", style="yellow")
+            result = agent.analyze_and_recommend(pain_point_data, max_solutions)
+
+            if cache_path is not None:
+                _store_cached_result(cache_path, result)
 
         # Display results
         display_analysis_results(result)
@@ -102,12 +249,21 @@ def analyze(
 
 
 @app.command()
-def list_features():
+def list_features(ctx: typer.Context):
     """List all available features in knowledge base"""
+    # Shell completion only parses arguments; don't import or load the agent
+    if ctx.resilient_parsing:
+        return
+
+    from rich.table import Table
+
+    from agent import get_agent
+
+    console = _console()
     print_header()
 
     try:
-        agent = PainPointAgent()
+        agent = get_agent()
         features = agent.list_available_features()
 
         if not features:
@@ -121,15 +277,14 @@ def list_features():
         table.add_column("Description", style="white")
 
         for feature in features:
+            description = feature["description"]
+            if len(description) > DESCRIPTION_PREVIEW_LENGTH:
+                description = description[:DESCRIPTION_PREVIEW_LENGTH] + "..."
             table.add_row(
                 feature["feature_id"],
                 feature["feature_name"],
                 feature["category"],
-                (
-                    feature["description"][:60] + "..."
-                    if len(feature["description"]) > 60
-                    else feature["description"]
-                ),
+                description,
             )
 
         console.print(table)
@@ -140,12 +295,19 @@ def list_features():
 
 
 @app.command()
-def feature_detail(feature_id: str):
+def feature_detail(ctx: typer.Context, feature_id: str):
     """View detailed information about a specific feature"""
+    # Shell completion only parses arguments; don't import or load the agent
+    if ctx.resilient_parsing:
+        return
+
+    from agent import get_agent
+
+    console = _console()
     print_header()
 
     try:
-        agent = PainPointAgent()
+        agent = get_agent()
         feature_detail = agent.get_feature_details(feature_id)
 
         if not feature_detail:
@@ -193,62 +355,39 @@ def feature_detail(feature_id: str):
 
 
 @app.command()
-def demo():
+def demo(ctx: typer.Context):
     """Run demo with pain point samples"""
-    print_header()
+    # Shell completion only parses arguments; don't import or load the agent
+    if ctx.resilient_parsing:
+        return
 
-    # Sample pain points
-    samples = [
-        {
-            "name": "E-commerce Feedback Collection",
-            "data": {
-                "pain_point": {
-                    "description": "We have difficulty collecting customer feedback after they purchase. Currently only about 5% of customers respond to email surveys.",
-                    "context": {
-                        "industry": "E-commerce",
-                        "company_size": "medium",
-                        "urgency_level": "high",
-                    },
-                    "affected_areas": ["customer_service", "marketing"],
-                }
-            },
-        },
-        {
-            "name": "Support Agent Overload",
-            "data": {
-                "pain_point": {
-                    "description": "Support agents are overwhelmed by repetitive questions, response time has slowed to an average of 4 hours.",
-                    "context": {
-                        "industry": "SaaS",
-                        "company_size": "large",
-                        "urgency_level": "high",
-                    },
-                    "affected_areas": ["customer_service"],
-                }
-            },
-        },
-    ]
+    from rich.prompt import Prompt
+
+    from agent import get_agent
+
+    console = _console()
+    print_header()
 
     console.print("🎮 Demo Mode - Choose pain point sample:", style="bold blue")
     console.print()
 
-    for i, sample in enumerate(samples, 1):
+    for i, sample in enumerate(DEMO_SAMPLES, 1):
         console.print(f"{i}. {sample['name']}")
 
     choice = Prompt.ask(
         "Choose sample number",
-        choices=[str(i) for i in range(1, len(samples) + 1)],
+        choices=DEMO_SAMPLE_CHOICES,
         default="1",
     )
 
-    selected_sample = samples[int(choice) - 1]
+    selected_sample = DEMO_SAMPLES[int(choice) - 1]
 
     console.print()
     console.print(f"🎯 Analyzing: {selected_sample['name']}", style="green")
     console.print()
 
     try:
-        agent = PainPointAgent()
+        agent = get_agent()
         result = agent.analyze_and_recommend(selected_sample["data"])
         display_analysis_results(result)
 
@@ -257,8 +396,11 @@ def demo():
         raise typer.Exit(1)
 
 
-def get_interactive_input() -> dict:
+def get_interactive_input() -> "PainPointInputDict":
     """Get input from user in interactive mode"""
+    from rich.prompt import Prompt
+
+    console = _console()
     console.print(
         "📝 Interactive Mode - Enter pain point information:", style="bold blue"
     )
@@ -273,24 +415,23 @@ def get_interactive_input() -> dict:
     # Company size
     company_size = Prompt.ask(
         "Company size",
-        choices=["startup", "small", "medium", "large", "enterprise"],
+        choices=COMPANY_SIZE_CHOICES,
         default="medium",
     )
 
     # Urgency level
     urgency_level = Prompt.ask(
-        "Urgency level", choices=["low", "medium", "high"], default="medium"
+        "Urgency level", choices=URGENCY_CHOICES, default="medium"
     )
 
     # Affected areas
     console.print("Affected areas (can select multiple, separated by commas):")
-    console.print("  - customer_service")
-    console.print("  - marketing")
-    console.print("  - sales")
-    console.print("  - operations")
+    console.print(AFFECTED_AREAS_HELP)
 
     affected_areas_input = Prompt.ask("Affected areas", default="customer_service")
-    affected_areas = [area.strip() for area in affected_areas_input.split(",")]
+    affected_areas = [
+        area for area in AREA_SEPARATOR_PATTERN.split(affected_areas_input) if area
+    ] or ["customer_service"]
 
     return {
         "pain_point": {
@@ -305,37 +446,68 @@ def get_interactive_input() -> dict:
     }
 
 
-def load_input_file(file_path: str) -> dict:
+def load_input_file(file_path: str) -> "PainPointInputDict":
     """Load input from JSON file"""
+    console = _console()
     try:
-        with open(file_path, "r", encoding="utf-8") as f:
-            return json.load(f)
+        with open(file_path, "rb") as f:
+            return orjson.loads(f.read())
     except FileNotFoundError:
         console.print(f"❌ File does not exist: {file_path}", style="red")
         raise typer.Exit(1)
-    except json.JSONDecodeError as e:
+    except orjson.JSONDecodeError as e:
         console.print(f"❌ Invalid JSON file: {e}", style="red")
         raise typer.Exit(1)
 
 
+def _write_json_result(result, path: Path) -> None:
+    """Write results as indented JSON"""
+    with open(path, "wb", buffering=1 << 20) as f:
+        f.write(
+            orjson.dumps(
+                result.model_dump(),
+                option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS,
+            )
+        )
+
+
+def _write_markdown_result(result, path: Path) -> None:
+    """Write results as a markdown report"""
+    from agent import export_markdown_report
+
+    export_markdown_report(result, str(path))
+
+
+# Output writer for each supported file extension
+OUTPUT_WRITERS = {
+    ".json": _write_json_result,
+    ".md": _write_markdown_result,
+}
+
+
 def save_output_file(result, file_path: str):
     """Save results to file"""
+    console = _console()
     try:
         output_path = Path(file_path)
 
-        if output_path.suffix.lower() == ".json":
-            with open(output_path, "w", encoding="utf-8") as f:
-                json.dump(result.dict(), f, ensure_ascii=False, indent=2)
-        elif output_path.suffix.lower() == ".md":
-            # Export as markdown
-            agent = PainPointAgent()
-            agent._export_markdown_report(result, str(output_path))
-        else:
+        writer = OUTPUT_WRITERS.get(output_path.suffix.lower())
+        if writer is None:
             console.print(
-                "❌ Only .json and .md output formats are supported", style="red"
+                f"❌ Only {' and '.join(OUTPUT_WRITERS)} output formats are supported",
+                style="red",
             )
             return
 
+        # Write next to the destination and swap it in atomically, so a
+        # failed write never leaves a truncated output file behind
+        tmp_path = output_path.with_name(output_path.name + ".tmp")
+        try:
+            writer(result, tmp_path)
+            os.replace(tmp_path, output_path)
+        finally:
+            tmp_path.unlink(missing_ok=True)
+
         console.print(f"💾 Results saved to: {output_path}", style="green")
 
     except Exception as e:
@@ -344,72 +516,112 @@ def save_output_file(result, file_path: str):
 
 def display_analysis_results(result):
     """Display analysis results with Rich formatting"""
-    console.print("📊 ANALYSIS RESULTS", style="bold blue")
-    console.print("=" * 50, style="blue")
-    console.print()
+    from rich.console import Group
+    from rich.panel import Panel
+
+    console = _console()
+
+    # Collect every line and panel, then render them with a single print
+    parts = []
+
+    def line(text: str = "", style: str = ""):
+        rendered = console.render_str(text)
+        rendered.style = style
+        parts.append(rendered)
+
+    line("📊 ANALYSIS RESULTS", style="bold blue")
+    line("=" * 50, style="blue")
+    line()
 
     # Analysis section
-    console.print("🔍 PAIN POINT ANALYSIS", style="bold green")
-    console.print(Panel(result.analysis.pain_point_summary, title="Summary"))
-    console.print(Panel(result.analysis.impact_assessment, title="Impact Assessment"))
+    analysis = result.analysis
+    line("🔍 PAIN POINT ANALYSIS", style="bold green")
+    parts.append(Panel(analysis.pain_point_summary, title="Summary"))
+    parts.append(Panel(analysis.impact_assessment, title="Impact Assessment"))
 
-    if result.analysis.key_challenges:
-        console.print("\n🎯 Key Challenges:", style="bold")
-        for challenge in result.analysis.key_challenges:
-            console.print(f"  • {challenge}")
+    if analysis.key_challenges:
+        line("\n🎯 Key Challenges:", style="bold")
+        for challenge in analysis.key_challenges:
+            line(f"  • {challenge}")
 
-    console.print()
+    line()
 
     # Solutions section
     if result.recommended_solutions:
-        console.print("💡 RECOMMENDED SOLUTIONS", style="bold green")
-        console.print()
+        line("💡 RECOMMENDED SOLUTIONS", style="bold green")
+        line()
 
         for i, solution in enumerate(result.recommended_solutions, 1):
-            console.print(
-                f"🚀 Solution {i}: {solution.solution_name}", style="bold cyan"
-            )
-            console.print(f"   📊 Relevance Score: {solution.relevance_score}/1.0")
-            console.print(f"   🔧 Complexity: {solution.complexity_level.value}")
-            console.print(f"   ⏱️ Setup Time: {solution.estimated_setup_time}")
-            console.print()
-            console.print(f"   💬 How it helps: {solution.how_it_helps}")
-            console.print()
+            line(f"🚀 Solution {i}: {solution.solution_name}", style="bold cyan")
+            line(f"   📊 Relevance Score: {solution.relevance_score}/1.0")
+            line(f"   🔧 Complexity: {solution.complexity_level.value}")
+            line(f"   ⏱️ Setup Time: {solution.estimated_setup_time}")
+            line()
+            line(f"   💬 How it helps: {solution.how_it_helps}")
+            line()
 
             if solution.implementation_steps:
-                console.print("   📋 Implementation Steps:")
+                line("   📋 Implementation Steps:")
                 for j, step in enumerate(solution.implementation_steps, 1):
-                    console.print(f"      {j}. {step}")
-                console.print()
+                    line(f"      {j}. {step}")
+                line()
 
             if solution.expected_outcomes and solution.expected_outcomes.short_term:
-                console.print("   🎯 Expected Short-term Outcomes:")
+                line("   🎯 Expected Short-term Outcomes:")
                 for outcome in solution.expected_outcomes.short_term:
-                    console.print(f"      • {outcome}")
-                console.print()
+                    line(f"      • {outcome}")
+                line()
 
-            console.print("-" * 50)
-            console.print()
+            line("-" * 50)
+            line()
 
     # Next steps
     if result.next_steps and result.next_steps.immediate_actions:
-        console.print("📝 NEXT STEPS", style="bold green")
+        line("📝 NEXT STEPS", style="bold green")
         for action in result.next_steps.immediate_actions:
-            console.print(f"  • {action}")
-        console.print()
+            line(f"  • {action}")
+        line()
+
+    console.print(Group(*parts))
 
 
 def handle_demo_requests(solutions):
     """Handle demo requests from user"""
+    from rich.prompt import Prompt
+
+    console = _console()
     console.print("🎬 Demo Requests:", style="bold blue")
+    console.print(
+        "\n".join(
+            f"  {i}. {solution.solution_name}"
+            for i, solution in enumerate(solutions, 1)
+        )
+    )
 
-    for i, solution in enumerate(solutions, 1):
-        request_demo = Confirm.ask(f"Request demo for {solution.solution_name}?")
-        if request_demo:
-            console.print(
-                f"✅ Demo request recorded for {solution.solution_name}", style="green"
-            )
-            # Here you can implement actual request logic
+    # Ask once for every solution instead of one confirmation per solution
+    picks = Prompt.ask(
+        "Solution numbers to request demos for (comma-separated, empty to skip)",
+        default="",
+        show_default=False,
+    )
+
+    selected = []
+    for pick in picks.split(","):
+        pick = pick.strip()
+        if not pick:
+            continue
+        if not pick.isdecimal() or not 1 <= int(pick) <= len(solutions):
+            console.print(f"⚠️ Ignoring invalid choice: {pick}", style="yellow")
+            continue
+        if int(pick) not in selected:
+            selected.append(int(pick))
+
+    for number in selected:
+        solution = solutions[number - 1]
+        console.print(
+            f"✅ Demo request recorded for {solution.solution_name}", style="green"
+        )
+        # Here you can implement actual request logic
 
     console.print()
     console.print("📧 To book an actual demo, please contact:", style="yellow")
@@ -3,11 +3,12 @@ Matching Engine for Pain Point to Solution Agent
 Core algorithm to find and evaluate solution relevance
 """
 
-from typing import List, Dict, Tuple, Optional
-import re
-import json
-from pathlib import Path
-import math
+from typing import Any, List, Dict, Set, Tuple, Optional
+from collections import OrderedDict
+from enum import Enum
+import logging
+
+import numpy as np
 
 from models import (
     PainPointInput,
@@ -17,8 +18,188 @@ from models import (
     FilumFeature,
     ExpectedOutcomes,
     ResourceRequirements,
+    CompanySize,
+    UrgencyLevel,
+)
+
+logger = logging.getLogger(__name__)
+
+# Direct mapping of pain point patterns with solutions
+PAIN_SOLUTION_MAPPING = {
+    # Customer Service & Support Issues
+    "support_response_time": {
+        "patterns": (
+            "time",
+            "wait",
+            "response time",
+            "slow",
+            "support",
+            "reply",
+        ),
+        "best_features": ("AI Inbox with Smart Routing", "AI Customer Service"),
+        "score_boost": 0.4,
+    },
+    "support_overload": {
+        "patterns": (
+            "overload",
+            "overwhelm",
+            "volume",
+            "many",
+            "repetitive",
+            "repeat",
+        ),
+        "best_features": ("AI Inbox with Smart Routing", "AI Customer Service"),
+        "score_boost": 0.4,
+    },
+    # Feedback Collection Issues
+    "feedback_collection": {
+        "patterns": ("feedback", "response", "collect", "survey", "collection"),
+        "best_features": ("Multi-Channel Surveys", "Voice of Customer"),
+        "score_boost": 0.4,
+    },
+    # Data Analysis Issues
+    "manual_analysis": {
+        "patterns": (
+            "manual",
+            "analysis",
+            "time-consuming",
+            "time consuming",
+        ),
+        "best_features": (
+            "AI-Powered Conversation Analysis",
+            "Customer Insights",
+        ),
+        "score_boost": 0.4,
+    },
+    # Customer Insights Issues
+    "customer_understanding": {
+        "patterns": (
+            "dont understand",
+            "insight",
+            "needs",
+            "behavior",
+            "understand",
+        ),
+        "best_features": ("Customer Journey Analytics", "Customer Insights"),
+        "score_boost": 0.4,
+    },
+    # Customer Profile Issues
+    "customer_history": {
+        "patterns": (
+            "history",
+            "profile",
+            "single view",
+            "unified",
+            "consolidated",
+            "view",
+            "interaction",
+            "contact again",
+        ),
+        "best_features": ("Customer 360", "Customer Profile"),
+        "score_boost": 0.4,
+    },
+}
+
+# Pain type order used for the columns of the feature weight matrix
+PAIN_TYPES = tuple(PAIN_SOLUTION_MAPPING)
+
+# (pain type, patterns, pattern count) rows of PAIN_SOLUTION_MAPPING
+PAIN_TYPE_PATTERNS = tuple(
+    (pain_type, config["patterns"], len(config["patterns"]))
+    for pain_type, config in PAIN_SOLUTION_MAPPING.items()
+)
+
+# Patterns that boost features of each category
+CATEGORY_PATTERNS = {
+    "AI_CUSTOMER_SERVICE": ("support", "agent", "customer service", "helpdesk"),
+    "VOC": ("feedback", "voice", "survey", "opinion"),
+    "INSIGHTS": ("insight", "analysis", "data", "report"),
+    "CUSTOMER_360": ("profile", "history", "view", "360", "unified"),
+    "AI_AUTOMATION": ("automation", "auto", "workflow"),
+}
+
+# Distinct patterns of both mappings, searched once per pain point. Many
+# patterns are shared ("support", "analysis", ...), and a C-level substring
+# check per distinct pattern is faster than a regex pass over the text
+MATCH_PATTERNS = tuple(
+    dict.fromkeys(
+        [
+            pattern
+            for config in PAIN_SOLUTION_MAPPING.values()
+            for pattern in config["patterns"]
+        ]
+        + [pattern for patterns in CATEGORY_PATTERNS.values() for pattern in patterns]
+    )
+)
+
+
+def _pattern_count_matrix(pattern_groups) -> np.ndarray:
+    """Count occurrences of each MATCH_PATTERNS entry in each pattern group"""
+    pattern_index = {pattern: i for i, pattern in enumerate(MATCH_PATTERNS)}
+    counts = np.zeros((len(pattern_groups), len(MATCH_PATTERNS)), dtype=np.int64)
+    for row, patterns in enumerate(pattern_groups):
+        for pattern in patterns:
+            counts[row, pattern_index[pattern]] += 1
+
+    return counts
+
+
+# Occurrences of each match pattern among the patterns of each pain type
+PAIN_TYPE_PATTERN_COUNTS = _pattern_count_matrix(
+    [patterns for _, patterns, _ in PAIN_TYPE_PATTERNS]
 )
 
+# Number of patterns of each pain type, ordered by PAIN_TYPES
+PAIN_TYPE_PATTERN_TOTALS = np.array(
+    [pattern_count for _, _, pattern_count in PAIN_TYPE_PATTERNS]
+)
+
+# Company sizes that benefit from comprehensive solutions. Members are str
+# enums, so the set matches both CompanySize members and their plain values
+LARGE_COMPANY_SIZES = frozenset({CompanySize.LARGE, CompanySize.ENTERPRISE})
+
+
+# First 5 implementation steps of a solution, {feature_name} is filled in
+DEFAULT_IMPLEMENTATION_STEPS = (
+    "Analyze current requirements and define specific objectives",
+    "Set up {feature_name} with matching configuration",
+    "Integrate with existing systems (CRM, database, etc.)",
+    "Train team on how to use the new feature",
+    "Pilot test with small customer group",
+)
+
+# Implementation steps of feature types, checked in order against the
+# lowercased feature name. Each adds a type-specific third step
+FEATURE_TYPE_IMPLEMENTATION_STEPS = tuple(
+    (
+        feature_type,
+        DEFAULT_IMPLEMENTATION_STEPS[:2] + (step,) + DEFAULT_IMPLEMENTATION_STEPS[2:4],
+    )
+    for feature_type, step in (
+        ("survey", "Design survey templates and matching questions"),
+        ("ai", "Train AI model with company data"),
+        ("analysis", "Prepare and clean data sources"),
+    )
+)
+
+# Decimals relevance scores are rounded to for ranking. The matrix
+# products add score terms in a different order than a per-feature sum, so
+# scores that are equal in exact arithmetic can differ in the last bit;
+# rounding makes them tie again and the stable sort keeps KB order
+SCORE_DECIMALS = 9
+
+# Number of recent matching results kept per engine
+SOLUTION_CACHE_SIZE = 256
+
+# Inputs that determine matching results: lowercased description, urgent and
+# large company flags, and max_solutions
+SolutionCacheKey = Tuple[str, bool, bool, int]
+
+
+def _enum_value(value) -> str:
+    """Get the plain value of an enum member, or the value as a string"""
+    return value.value if isinstance(value, Enum) else str(value)
+
 
 class MatchingEngine:
     """Engine to match pain points with Filum.ai features"""
@@ -33,22 +214,59 @@ class MatchingEngine:
         self.knowledge_base: Optional[KnowledgeBase] = None
         self.features: List[KnowledgeBaseFeature] = []
 
+        # Pattern boost weights, one row per feature and one column per pain type
+        self._pain_type_weights = np.zeros((0, len(PAIN_TYPES)))
+
+        # Category pattern occurrences, one row per feature and one column
+        # per match pattern, and the number of category patterns per feature
+        self._category_pattern_counts = np.zeros(
+            (0, len(MATCH_PATTERNS)), dtype=np.int64
+        )
+        self._category_pattern_totals = np.ones(0, dtype=np.int64)
+
+        # Whether each feature is an AI solution preferred for urgent issues
+        self._ai_features = np.zeros(0, dtype=bool)
+
+        # Recent matching results, least recently used first
+        self._solution_cache: "OrderedDict[SolutionCacheKey, Tuple[Solution, ...]]" = (
+            OrderedDict()
+        )
+
+        # Solution fields that only depend on the feature, keyed by feature_id
+        self._solution_fields: Dict[str, Dict[str, Any]] = {}
+
         if knowledge_base_path:
             self.load_knowledge_base(knowledge_base_path)
 
     def load_knowledge_base(self, file_path: str) -> None:
-        """Load knowledge base from JSON file"""
-        try:
-            with open(file_path, "r", encoding="utf-8") as f:
-                data = json.load(f)
+        """
+        Load knowledge base from JSON file
 
-            self.knowledge_base = KnowledgeBase(**data)
-            self.features = self.knowledge_base.features
-            print(f"✅ Loaded {len(self.features)} features from knowledge base")
+        Args:
+            file_path: Path to knowledge base JSON file
 
-        except Exception as e:
-            print(f"❌ Error loading knowledge base: {e}")
-            raise
+        Raises:
+            OSError: If file can't be read
+            pydantic.ValidationError: If JSON is invalid or doesn't match
+                KnowledgeBase
+        """
+        # Parse and validate in one pass in pydantic-core, without building
+        # an intermediate dict of Python objects
+        with open(file_path, "rb") as f:
+            self.knowledge_base = KnowledgeBase.model_validate_json(f.read())
+        self.features = self.knowledge_base.features
+        self._pain_type_weights = self._build_pain_type_weights()
+        self._build_category_patterns()
+        self._ai_features = np.array(
+            [self._is_ai_feature(feature) for feature in self.features],
+            dtype=bool,
+        )
+        self._solution_fields = {
+            feature.feature_id: self._get_solution_fields(feature)
+            for feature in self.features
+        }
+        self._solution_cache.clear()
+        logger.info("Loaded %d features from knowledge base", len(self.features))
 
     def find_matching_solutions(
         self, pain_point: PainPointInput, max_solutions: int = 5
@@ -68,419 +286,258 @@ class MatchingEngine:
                 "Knowledge base not loaded. Call load_knowledge_base() first."
             )
 
-        # Calculate relevance score for each feature
-        feature_scores = []
-        for feature in self.features:
-            score = self._calculate_relevance_score(pain_point, feature)
-            if score > 0.1:  # Only keep features with sufficient score
-                feature_scores.append((feature, score))
+        # Return previous result for a pain point that matches the same way
+        cache_key = self._solution_cache_key(pain_point, max_solutions)
+        cached = self._solution_cache.get(cache_key)
+        if cached is not None:
+            self._solution_cache.move_to_end(cache_key)
+            return list(cached)
 
-        # Sort by score descending
-        feature_scores.sort(key=lambda x: x[1], reverse=True)
-
-        # Convert to Solution objects
-        solutions = []
-        for i, (feature, score) in enumerate(feature_scores[:max_solutions]):
-            solution = self._create_solution_from_feature(
-                feature, score, f"solution_{i+1}", pain_point
-            )
-            solutions.append(solution)
+        solutions = self._select_solutions(
+            pain_point, self._score_features([pain_point])[0], max_solutions
+        )
+        self._solution_cache_store(cache_key, solutions)
 
         return solutions
 
-    def _calculate_relevance_score(
-        self, pain_point: PainPointInput, feature: KnowledgeBaseFeature
-    ) -> float:
+    def find_matching_solutions_batch(
+        self, pain_points: List[PainPointInput], max_solutions: int = 5
+    ) -> List[List[Solution]]:
         """
-        Calculate relevance score between pain point and feature
-        Use simple but effective semantic matching
+        Find solutions for several pain points at once
+
+        Scores of all pain points without cached result are computed
+        together, see _score_features.
 
         Args:
-            pain_point: Input pain point
-            feature: Feature from knowledge base
+            pain_points: Input pain points from user
+            max_solutions: Maximum number of solutions per pain point
 
         Returns:
-            Score from 0.0 to 1.0
+            List of solution lists, in the same order as pain_points
         """
-        pain_text = pain_point.pain_point.description.lower()
-
-        # Direct mapping of pain point patterns with solutions
-        pain_solution_mapping = {
-            # Customer Service & Support Issues
-            "support_response_time": {
-                "patterns": [
-                    "time",
-                    "wait",
-                    "response time",
-                    "slow",
-                    "support",
-                    "reply",
-                ],
-                "best_features": ["AI Inbox with Smart Routing", "AI Customer Service"],
-                "score_boost": 0.4,
-            },
-            "support_overload": {
-                "patterns": [
-                    "overload",
-                    "overwhelm",
-                    "volume",
-                    "many",
-                    "repetitive",
-                    "repeat",
-                ],
-                "best_features": ["AI Inbox with Smart Routing", "AI Customer Service"],
-                "score_boost": 0.4,
-            },
-            # Feedback Collection Issues
-            "feedback_collection": {
-                "patterns": ["feedback", "response", "collect", "survey", "collection"],
-                "best_features": ["Multi-Channel Surveys", "Voice of Customer"],
-                "score_boost": 0.4,
-            },
-            # Data Analysis Issues
-            "manual_analysis": {
-                "patterns": [
-                    "manual",
-                    "analysis",
-                    "analysis",
-                    "time-consuming",
-                    "time consuming",
-                ],
-                "best_features": [
-                    "AI-Powered Conversation Analysis",
-                    "Customer Insights",
-                ],
-                "score_boost": 0.4,
-            },
-            # Customer Insights Issues
-            "customer_understanding": {
-                "patterns": [
-                    "dont understand",
-                    "insight",
-                    "needs",
-                    "behavior",
-                    "behavior",
-                    "understand",
-                ],
-                "best_features": ["Customer Journey Analytics", "Customer Insights"],
-                "score_boost": 0.4,
-            },
-            # Customer Profile Issues
-            "customer_history": {
-                "patterns": [
-                    "history",
-                    "history",
-                    "profile",
-                    "single view",
-                    "unified",
-                    "consolidated",
-                    "view",
-                    "interaction",
-                    "contact again",
-                ],
-                "best_features": ["Customer 360", "Customer Profile"],
-                "score_boost": 0.4,
-            },
-        }
+        if not self.features:
+            raise ValueError(
+                "Knowledge base not loaded. Call load_knowledge_base() first."
+            )
 
-        base_score = 0.1  # Base score for all features
-        feature_name = feature.feature_name
+        if not pain_points:
+            return []
 
-        # Check pain point patterns
-        for pain_type, config in pain_solution_mapping.items():
-            pattern_matches = sum(
-                1 for pattern in config["patterns"] if pattern in pain_text
-            )
+        cache_keys = [
+            self._solution_cache_key(pain_point, max_solutions)
+            for pain_point in pain_points
+        ]
+        results: List[Optional[List[Solution]]] = []
+        for cache_key in cache_keys:
+            cached = self._solution_cache.get(cache_key)
+            if cached is not None:
+                self._solution_cache.move_to_end(cache_key)
+                cached = list(cached)
+            results.append(cached)
+
+        # Score only the pain points without cached result, all at once
+        misses = [i for i, result in enumerate(results) if result is None]
+        if misses:
+            scores = self._score_features([pain_points[i] for i in misses])
+            for i, feature_scores in zip(misses, scores):
+                results[i] = self._select_solutions(
+                    pain_points[i], feature_scores, max_solutions
+                )
+                self._solution_cache_store(cache_keys[i], results[i])
+
+        return results
+
+    def _solution_cache_key(
+        self, pain_point: PainPointInput, max_solutions: int
+    ) -> SolutionCacheKey:
+        """
+        Build the solution cache key of a pain point
 
-            if pattern_matches > 0:
-                # Check if this feature is a best match for this pain type
-                if any(
-                    best_feature in feature_name
-                    for best_feature in config["best_features"]
-                ):
-                    base_score += config["score_boost"] * (
-                        pattern_matches / len(config["patterns"])
-                    )
-                else:
-                    # Slight boost for related features
-                    base_score += 0.1 * (pattern_matches / len(config["patterns"]))
-
-        # Additional scoring based on feature category
-        category_boost = self._get_category_boost(pain_text, feature)
-        base_score += category_boost
-
-        # Context-based adjustments
-        context_boost = self._get_context_boost(pain_point, feature)
-        base_score += context_boost
-
-        return min(base_score, 1.0)  # Cap at 1.0
-
-    def _get_category_boost(
-        self, pain_text: str, feature: KnowledgeBaseFeature
-    ) -> float:
-        """Boost score based on category matching"""
-        category = feature.category  # Use 'category' instead of 'feature_category'
-
-        category_patterns = {
-            "AI_CUSTOMER_SERVICE": ["support", "agent", "customer service", "helpdesk"],
-            "VOC": ["feedback", "voice", "survey", "opinion"],
-            "INSIGHTS": ["insight", "analysis", "data", "report", "analysis"],
-            "CUSTOMER_360": ["profile", "history", "view", "360", "unified"],
-            "AI_AUTOMATION": ["automation", "auto", "workflow"],
-        }
+        Only the description and the context flags affect scores and
+        generated solutions, so pain points that differ in other fields
+        (industry, affected areas, preferences, ...) share an entry.
+        """
+        is_urgent, is_large = self._get_context_flags(pain_point)
+        return (
+            pain_point.pain_point.description.lower(),
+            is_urgent,
+            is_large,
+            max_solutions,
+        )
 
-        if hasattr(category, "value"):
-            category_value = category.value
-        else:
-            category_value = str(category)
+    def _solution_cache_store(
+        self, key: SolutionCacheKey, solutions: List[Solution]
+    ) -> None:
+        """Store solutions in solution cache, evicting least recently used"""
+        self._solution_cache[key] = tuple(solutions)
+        if len(self._solution_cache) > SOLUTION_CACHE_SIZE:
+            self._solution_cache.popitem(last=False)
 
-        patterns = category_patterns.get(category_value, [])
-        matches = sum(1 for pattern in patterns if pattern in pain_text)
+    def _score_features(self, pain_points: List[PainPointInput]) -> np.ndarray:
+        """
+        Calculate relevance scores of all features for each pain point
 
-        return min(0.3 * matches / len(patterns) if patterns else 0, 0.3)
+        Each description is searched once for MATCH_PATTERNS. Matrix products
+        of the (pain points x patterns) hits then give the pattern scores and
+        category boosts of every feature, so no Python code runs per feature.
 
-    def _get_context_boost(
-        self, pain_point: PainPointInput, feature: KnowledgeBaseFeature
-    ) -> float:
-        """Boost score based on context (urgency, company size, etc.)"""
-        boost = 0.0
-        context = pain_point.pain_point.context
+        Args:
+            pain_points: Input pain points
 
-        if not context:
-            return boost
-
-        # Urgency boost - urgent problems need quick solutions
-        if hasattr(context, "urgency_level") and context.urgency_level:
-            urgency = (
-                context.urgency_level.value
-                if hasattr(context.urgency_level, "value")
-                else str(context.urgency_level)
-            )
-            if urgency == "high":
-                # Prefer AI/automation solutions for urgent issues
-                if "AI" in feature.feature_name or "Smart" in feature.feature_name:
-                    boost += 0.1
-
-        # Company size boost
-        if hasattr(context, "company_size") and context.company_size:
-            size = (
-                context.company_size.value
-                if hasattr(context.company_size, "value")
-                else str(context.company_size)
-            )
-            if size in ["large", "enterprise"]:
-                # Large companies benefit more from comprehensive solutions
-                boost += 0.05
-
-        return boost
-
-    def _calculate_keyword_similarity(
-        self, pain_point: PainPointInput, feature: KnowledgeBaseFeature
-    ) -> float:
-        """Calculate keyword similarity between pain point and feature"""
-        # Extract keywords from pain point description
-        pain_keywords = self._extract_keywords(
-            pain_point.pain_point.description.lower()
+        Returns:
+            (pain points x features) array of scores from 0.0 to 1.0
+        """
+        # Not split across a thread pool: the substring checks below hold the
+        # GIL, and the matrix products are already multithreaded by BLAS for
+        # large knowledge bases, so threads only add overhead
+        pain_texts = [
+            pain_point.pain_point.description.lower() for pain_point in pain_points
+        ]
+        hits = np.array(
+            [
+                [pattern in pain_text for pattern in MATCH_PATTERNS]
+                for pain_text in pain_texts
+            ],
+            dtype=np.int64,
         )
 
-        # Get all keywords from feature
-        feature_keywords = []
-        for pain_addressed in feature.pain_points_addressed:
-            feature_keywords.extend([kw.lower() for kw in pain_addressed.keywords])
-
-        if not feature_keywords:
-            return 0.0
-
-        # Calculate number of keyword matches
-        matches = 0
-        for pain_kw in pain_keywords:
-            for feature_kw in feature_keywords:
-                if pain_kw in feature_kw or feature_kw in pain_kw:
-                    matches += 1
-                    break
-
-        # Normalize by number of pain keywords
-        return matches / len(pain_keywords) if pain_keywords else 0.0
-
-    def _calculate_category_alignment(
-        self, pain_point: PainPointInput, feature: KnowledgeBaseFeature
-    ) -> float:
-        """Calculate category matching between pain point and feature"""
-        pain_description = pain_point.pain_point.description.lower()
-
-        # Mapping categories with keywords
-        category_keywords = {
-            "feedback_collection": ["feedback", "survey"],
-            "support_overload": ["support", "agent", "overload", "volume"],
-            "customer_visibility": ["profile", "history", "view", "unified", "single"],
-            "journey_visibility": ["journey", "touchpoint", "experience", "friction"],
-            "data_analysis": ["analysis", "insight", "manual", "data"],
-        }
+        # Fraction of patterns found for each pain type
+        ratios = (hits @ PAIN_TYPE_PATTERN_COUNTS.T) / PAIN_TYPE_PATTERN_TOTALS
+        pattern_scores = 0.1 + ratios @ self._pain_type_weights.T
 
-        max_score = 0.0
-        for pain_addressed in feature.pain_points_addressed:
-            category = pain_addressed.pain_category
-            if category in category_keywords:
-                keywords = category_keywords[category]
-                matches = sum(1 for kw in keywords if kw in pain_description)
-                score = matches / len(keywords)
-                max_score = max(max_score, score)
-
-        return max_score
-
-    def _calculate_context_fit(
-        self, pain_point: PainPointInput, feature: KnowledgeBaseFeature
-    ) -> float:
-        """Calculate context matching (industry, company size, etc.)"""
-        context = pain_point.pain_point.context
-        if not context:
-            return 0.5  # Neutral score if no context
-
-        score = 0.0
-        score_count = 0
-
-        # Check industry match
-        if context.industry:
-            for pain_addressed in feature.pain_points_addressed:
-                if context.industry in pain_addressed.business_contexts:
-                    score += 1.0
-                    score_count += 1
-                    break
-            if score_count == 0:
-                score_count += 1  # Add neutral score
-
-        # Check company size compatibility
-        if context.company_size:
-            # Features with high complexity match with large companies
-            complexity_size_fit = {
-                "low": ["startup", "small"],
-                "medium": ["small", "medium", "large"],
-                "high": ["medium", "large", "enterprise"],
-            }
-
-            complexity = feature.implementation.complexity.value
-            if context.company_size.value in complexity_size_fit.get(complexity, []):
-                score += 1.0
-            else:
-                score += 0.3  # Partial match
-            score_count += 1
-
-        # Check urgency vs complexity
-        if context.urgency_level:
-            urgency = context.urgency_level.value
-            complexity = feature.implementation.complexity.value
-
-            # High urgency needs low complexity
-            urgency_complexity_fit = {
-                "high": {"low": 1.0, "medium": 0.6, "high": 0.3},
-                "medium": {"low": 0.8, "medium": 1.0, "high": 0.7},
-                "low": {"low": 0.6, "medium": 0.8, "high": 1.0},
-            }
-
-            score += urgency_complexity_fit.get(urgency, {}).get(complexity, 0.5)
-            score_count += 1
-
-        return score / score_count if score_count > 0 else 0.5
-
-    def _calculate_capability_alignment(
-        self, pain_point: PainPointInput, feature: KnowledgeBaseFeature
-    ) -> float:
-        """Calculate capability matching with requirements"""
-        pain_description = pain_point.pain_point.description.lower()
-        affected_areas = pain_point.pain_point.affected_areas
-
-        capability_score = 0.0
-        total_capabilities = len(feature.capabilities)
-
-        if total_capabilities == 0:
-            return 0.0
-
-        for capability in feature.capabilities:
-            cap_description = capability.description.lower()
-            cap_name = capability.capability_name.lower()
-
-            # Check keyword overlap
-            capability_keywords = self._extract_keywords(
-                cap_description + " " + cap_name
+        # Matches never exceed the pattern count, so category boosts stay
+        # within 0.3 without a cap of their own
+        category_matches = hits @ self._category_pattern_counts.T
+        category_boosts = 0.3 * category_matches / self._category_pattern_totals
+
+        scores = pattern_scores
+        scores += category_boosts
+
+        # Context boosts are all zero unless a pain point is urgent or from a
+        # large company, so the common case skips building and adding them
+        context_flags = [
+            self._get_context_flags(pain_point) for pain_point in pain_points
+        ]
+        if any(is_urgent or is_large for is_urgent, is_large in context_flags):
+            scores += np.array(
+                [
+                    self._get_context_boosts(is_urgent, is_large)
+                    for is_urgent, is_large in context_flags
+                ]
             )
-            pain_keywords = self._extract_keywords(pain_description)
 
-            matches = sum(
-                1
-                for pain_kw in pain_keywords
-                for cap_kw in capability_keywords
-                if pain_kw in cap_kw or cap_kw in pain_kw
+        # Cap at 1.0
+        return np.clip(scores, 0.0, 1.0, out=scores)
+
+    def _select_solutions(
+        self,
+        pain_point: PainPointInput,
+        scores: np.ndarray,
+        max_solutions: int,
+    ) -> List[Solution]:
+        """Build solutions from the top scored features"""
+        # Only keep features with sufficient score, and order them by score
+        # descending. The stable sort keeps KB order for ties
+        rank_scores = np.round(scores, SCORE_DECIMALS)
+        candidates = np.flatnonzero(rank_scores > 0.1)
+        top_indices = candidates[
+            np.argsort(-rank_scores[candidates], kind="stable")
+        ]
+
+        # Convert to Solution objects
+        solutions = []
+        for rank, i in enumerate(top_indices[: max(max_solutions, 0)].tolist()):
+            solution = self._create_solution_from_feature(
+                self.features[i], float(scores[i]), f"solution_{rank+1}", pain_point
             )
+            solutions.append(solution)
 
-            if matches > 0:
-                capability_score += 1.0
+        return solutions
 
-            # Check use cases alignment
-            for use_case in capability.use_cases:
-                use_case_lower = use_case.lower()
-                for area in affected_areas:
-                    if area.lower() in use_case_lower:
-                        capability_score += 0.5
-                        break
+    def _get_best_pain_types(self, feature: KnowledgeBaseFeature) -> Set[str]:
+        """Get pain types for which the feature is one of the best features"""
+        return {
+            pain_type
+            for pain_type, config in PAIN_SOLUTION_MAPPING.items()
+            if any(
+                best_feature in feature.feature_name
+                for best_feature in config["best_features"]
+            )
+        }
+
+    def _build_pain_type_weights(self) -> np.ndarray:
+        """
+        Build (features x pain types) matrix of pattern score boosts
 
-        return min(capability_score / total_capabilities, 1.0)
+        Kept in float64 rather than quantized: the matrix is tiny and scores
+        are rounded to 2 decimals and thresholded, so lossy weights could
+        change which solutions are returned.
+        """
+        weights = np.empty((len(self.features), len(PAIN_TYPES)))
+        for i, feature in enumerate(self.features):
+            best_pain_types = self._get_best_pain_types(feature)
+            for j, pain_type in enumerate(PAIN_TYPES):
+                if pain_type in best_pain_types:
+                    weights[i, j] = PAIN_SOLUTION_MAPPING[pain_type]["score_boost"]
+                else:
+                    # Slight boost for related features
+                    weights[i, j] = 0.1
 
-    def _calculate_complexity_fit(
-        self, pain_point: PainPointInput, feature: KnowledgeBaseFeature
-    ) -> float:
-        """Calculate complexity matching with user constraints"""
-        preferences = pain_point.preferences
+        return weights
+
+    def _build_category_patterns(self) -> None:
+        """Build category pattern counts and totals of the loaded features"""
+        category_patterns = [
+            CATEGORY_PATTERNS.get(self._get_category_value(feature), ())
+            for feature in self.features
+        ]
+        self._category_pattern_counts = _pattern_count_matrix(category_patterns)
+        # Features without category patterns have no matches, so a total of
+        # 1 gives them a boost of 0 without dividing by zero
+        self._category_pattern_totals = np.array(
+            [len(patterns) or 1 for patterns in category_patterns], dtype=np.int64
+        )
+
+    def _get_category_value(self, feature: KnowledgeBaseFeature) -> str:
+        """Get the plain category value of a feature"""
+        # Use 'category' instead of 'feature_category'
+        return _enum_value(feature.category)
+
+    def _is_ai_feature(self, feature: KnowledgeBaseFeature) -> bool:
+        """Check if a feature is an AI solution preferred for urgent issues"""
+        return "AI" in feature.feature_name or "Smart" in feature.feature_name
+
+    def _get_context_boosts(self, is_urgent: bool, is_large: bool) -> np.ndarray:
+        """Calculate context boost of every loaded feature"""
+        if is_urgent:
+            boosts = np.where(self._ai_features, 0.1, 0.0)
+        else:
+            boosts = np.zeros(len(self.features))
+
+        if is_large:
+            boosts += 0.05
+
+        return boosts
+
+    def _get_context_flags(self, pain_point: PainPointInput) -> Tuple[bool, bool]:
+        """
+        Get context flags that boost scores
+
+        Returns:
+            Whether the pain point is urgent and whether the company is large
+        """
         context = pain_point.pain_point.context
 
-        if not preferences and not context:
-            return 0.7  # Neutral score
-
-        complexity = feature.implementation.complexity.value
-        score = 0.7  # Base score
-
-        # Check urgency vs complexity
-        if context and context.urgency_level:
-            urgency = context.urgency_level.value
-            if urgency == "high" and complexity == "low":
-                score = 1.0
-            elif urgency == "high" and complexity == "high":
-                score = 0.3
-            elif urgency == "medium" and complexity == "medium":
-                score = 1.0
-
-        # Check timeline preferences
-        if preferences and preferences.implementation_timeline:
-            timeline = preferences.implementation_timeline.lower()
-            if ("quick" in timeline or "fast" in timeline) and complexity == "high":
-                score *= 0.5
-            elif ("long" in timeline or "detailed" in timeline) and complexity == "low":
-                score *= 0.8
-
-        return score
-
-    def _extract_keywords(self, text: str) -> List[str]:
-        """Extract keywords from text"""
-        # Remove stop words and special characters
-        stop_words = {
-            "and",
-            "or",
-            "the",
-            "a",
-            "an",
-            "in",
-            "on",
-            "at",
-            "to",
-            "for",
-            "of",
-            "with",
-        }
+        if not context:
+            return False, False
 
-        # Extract words and normalize
-        words = re.findall(r"\b\w+\b", text.lower())
-        keywords = [word for word in words if len(word) > 2 and word not in stop_words]
+        # Levels are str enums, so members and plain values compare and
+        # hash the same without unwrapping .value
+        is_urgent = getattr(context, "urgency_level", None) == UrgencyLevel.HIGH
+        is_large = getattr(context, "company_size", None) in LARGE_COMPANY_SIZES
 
-        return list(set(keywords))  # Remove duplicates
+        return is_urgent, is_large
 
     def _create_solution_from_feature(
         self,
@@ -490,7 +547,36 @@ class MatchingEngine:
         pain_point: PainPointInput,
     ) -> Solution:
         """Create Solution object from KnowledgeBaseFeature"""
+        solution_fields = self._solution_fields.get(feature.feature_id)
+        if solution_fields is None:
+            solution_fields = self._get_solution_fields(feature)
+
+        # The cached fields are shared by every solution of the feature, so
+        # each solution gets its own lists; a caller editing one result must
+        # not change the solutions returned by later analyses
+        expected_outcomes = solution_fields["expected_outcomes"]
+        return Solution.trusted(
+            solution_id=solution_id,
+            solution_name=solution_fields["solution_name"],
+            filum_features=list(solution_fields["filum_features"]),
+            how_it_helps=self._generate_how_it_helps(feature, pain_point),
+            implementation_steps=list(solution_fields["implementation_steps"]),
+            expected_outcomes=expected_outcomes.model_copy(
+                update={
+                    "short_term": list(expected_outcomes.short_term),
+                    "long_term": list(expected_outcomes.long_term),
+                }
+            ),
+            relevance_score=round(relevance_score, 2),
+            complexity_level=solution_fields["complexity_level"],
+            estimated_setup_time=solution_fields["estimated_setup_time"],
+            resource_requirements=solution_fields["resource_requirements"],
+            success_metrics=list(solution_fields["success_metrics"]),
+            related_case_studies=list(solution_fields["related_case_studies"]),
+        )
 
+    def _get_solution_fields(self, feature: KnowledgeBaseFeature) -> Dict[str, Any]:
+        """Build the Solution fields that only depend on the feature"""
         # Create FilumFeature
         filum_feature = FilumFeature(
             feature_category=feature.category,
@@ -498,9 +584,6 @@ class MatchingEngine:
             feature_description=feature.description.detailed,
         )
 
-        # Generate implementation steps
-        implementation_steps = self._generate_implementation_steps(feature, pain_point)
-
         # Generate expected outcomes
         expected_outcomes = ExpectedOutcomes(
             short_term=(
@@ -520,50 +603,36 @@ class MatchingEngine:
             ongoing_maintenance="Regular monitoring and optimization",
         )
 
-        # Generate how it helps
-        how_it_helps = self._generate_how_it_helps(feature, pain_point)
-
-        return Solution(
-            solution_id=solution_id,
-            solution_name=f"{feature.feature_name} Solution",
-            filum_features=[filum_feature],
-            how_it_helps=how_it_helps,
-            implementation_steps=implementation_steps,
-            expected_outcomes=expected_outcomes,
-            relevance_score=round(relevance_score, 2),
-            complexity_level=feature.implementation.complexity,
-            estimated_setup_time=feature.implementation.setup_time,
-            resource_requirements=resource_requirements,
-            success_metrics=self._generate_success_metrics(feature),
-            related_case_studies=[
+        return {
+            "solution_name": f"{feature.feature_name} Solution",
+            "filum_features": [filum_feature],
+            "implementation_steps": self._generate_implementation_steps(feature),
+            "expected_outcomes": expected_outcomes,
+            "complexity_level": feature.implementation.complexity,
+            "estimated_setup_time": feature.implementation.setup_time,
+            "resource_requirements": resource_requirements,
+            "success_metrics": self._generate_success_metrics(feature),
+            "related_case_studies": [
                 story.challenge + " -> " + story.results
                 for story in feature.success_stories[:1]
             ],
-        )
+        }
 
     def _generate_implementation_steps(
-        self, feature: KnowledgeBaseFeature, pain_point: PainPointInput
+        self, feature: KnowledgeBaseFeature
     ) -> List[str]:
         """Generate implementation steps for solution"""
-        steps = [
-            "Analyze current requirements and define specific objectives",
-            f"Set up {feature.feature_name} with matching configuration",
-            "Integrate with existing systems (CRM, database, etc.)",
-            "Train team on how to use the new feature",
-            "Pilot test with small customer group",
-            "Monitor results and optimize configuration",
-            "Deploy full-scale and track metrics",
-        ]
-
         # Customize based on feature type
-        if "survey" in feature.feature_name.lower():
-            steps.insert(2, "Design survey templates and matching questions")
-        elif "ai" in feature.feature_name.lower():
-            steps.insert(2, "Train AI model with company data")
-        elif "analysis" in feature.feature_name.lower():
-            steps.insert(2, "Prepare and clean data sources")
-
-        return steps[:5]  # Limit to 5 steps
+        feature_name = feature.feature_name.lower()
+        template = DEFAULT_IMPLEMENTATION_STEPS
+        for feature_type, steps in FEATURE_TYPE_IMPLEMENTATION_STEPS:
+            if feature_type in feature_name:
+                template = steps
+                break
+
+        steps = list(template)
+        steps[1] = steps[1].format(feature_name=feature.feature_name)
+        return steps
 
     def _generate_how_it_helps(
         self, feature: KnowledgeBaseFeature, pain_point: PainPointInput
@@ -3,10 +3,12 @@ Data models for Pain Point to Solution Agent
 Define data structures for input, output and knowledge base
 """
 
-from typing import List, Optional, Dict, Any
-from pydantic import BaseModel, Field
+from typing import List, Optional, Dict, Any, Type, TypedDict, TypeVar
+from pydantic import BaseModel, ConfigDict, Field
 from enum import Enum
 
+TrustedModelT = TypeVar("TrustedModelT", bound="TrustedModel")
+
 
 class UrgencyLevel(str, Enum):
     """Urgency level of pain point"""
@@ -56,6 +58,8 @@ class FilumCategory(str, Enum):
 class PainPointContext(BaseModel):
     """Pain point context"""
 
+    model_config = ConfigDict(frozen=True)
+
     industry: Optional[str] = Field(None, description="Customer industry")
     company_size: Optional[CompanySize] = Field(None, description="Scale company")
     current_tools: Optional[List[str]] = Field(
@@ -68,6 +72,8 @@ class PainPointContext(BaseModel):
 class CurrentImpactMetrics(BaseModel):
     """Current impact metrics"""
 
+    model_config = ConfigDict(frozen=True)
+
     customer_satisfaction: Optional[str] = Field(
         None, description="Customer satisfaction score"
     )
@@ -80,6 +86,8 @@ class CurrentImpactMetrics(BaseModel):
 class CurrentImpact(BaseModel):
     """Current impact of pain point"""
 
+    model_config = ConfigDict(frozen=True)
+
     description: str = Field(..., description="Impact description")
     metrics: Optional[CurrentImpactMetrics] = Field(
         default_factory=CurrentImpactMetrics
@@ -89,6 +97,8 @@ class CurrentImpact(BaseModel):
 class PainPointData(BaseModel):
     """Main pain point data"""
 
+    model_config = ConfigDict(frozen=True)
+
     description: str = Field(..., description="Detailed problem description")
     context: Optional[PainPointContext] = Field(default_factory=PainPointContext)
     affected_areas: List[str] = Field(
@@ -100,6 +110,8 @@ class PainPointData(BaseModel):
 class UserPreferences(BaseModel):
     """User preferences"""
 
+    model_config = ConfigDict(frozen=True)
+
     solution_types: Optional[List[str]] = Field(
         default_factory=list, description="Preferred solution types"
     )
@@ -114,13 +126,71 @@ class UserPreferences(BaseModel):
 class PainPointInput(BaseModel):
     """Input schema cho agent"""
 
+    # Validated input is keyed into the agent's caches, so it is read-only
+    model_config = ConfigDict(frozen=True)
+
     pain_point: PainPointData
     preferences: Optional[UserPreferences] = Field(default_factory=UserPreferences)
 
 
+# Raw input shapes, as read from JSON files or prompts before validation
+
+
+class PainPointContextDict(TypedDict, total=False):
+    """Raw pain point context"""
+
+    industry: Optional[str]
+    company_size: str
+    current_tools: List[str]
+    urgency_level: str
+    budget_range: Optional[str]
+
+
+class _PainPointDataRequired(TypedDict):
+    description: str
+
+
+class PainPointDataDict(_PainPointDataRequired, total=False):
+    """Raw pain point data"""
+
+    context: PainPointContextDict
+    affected_areas: List[str]
+    current_impact: Dict[str, Any]
+
+
+class _PainPointInputRequired(TypedDict):
+    pain_point: PainPointDataDict
+
+
+class PainPointInputDict(_PainPointInputRequired, total=False):
+    """Raw input accepted by PainPointInput"""
+
+    preferences: Dict[str, Any]
+
+
+class TrustedModel(BaseModel):
+    """Output model that the agent can build without re-validating its own data"""
+
+    @classmethod
+    def trusted(cls: Type[TrustedModelT], **kwargs: Any) -> TrustedModelT:
+        """
+        Build an instance from trusted data, skipping validation
+
+        Args:
+            **kwargs: Field values, already of the declared types
+
+        Returns:
+            Model instance with defaults filled for omitted fields
+        """
+        return cls.model_construct(**kwargs)
+
+
 class FilumFeature(BaseModel):
     """Information about a Filum.ai feature"""
 
+    # Built once per feature and shared by its solutions, so read-only
+    model_config = ConfigDict(frozen=True)
+
     feature_category: FilumCategory = Field(..., description="Feature category")
     feature_name: str = Field(..., description="Feature name")
     feature_description: str = Field(..., description="Feature description")
@@ -129,6 +199,9 @@ class FilumFeature(BaseModel):
 class ExpectedOutcomes(BaseModel):
     """Expected results from solution"""
 
+    # Built once per feature and copied into its solutions, so read-only
+    model_config = ConfigDict(frozen=True)
+
     short_term: List[str] = Field(
         default_factory=list, description="Short-term results"
     )
@@ -138,14 +211,20 @@ class ExpectedOutcomes(BaseModel):
 class ResourceRequirements(BaseModel):
     """Resource requirements for implementation"""
 
+    # Built once per feature and shared by its solutions, so read-only
+    model_config = ConfigDict(frozen=True)
+
     technical: Optional[str] = Field(None, description="Technical requirements")
     training: Optional[str] = Field(None, description="Required training")
     ongoing_maintenance: Optional[str] = Field(None, description="Ongoing maintenance")
 
 
-class Solution(BaseModel):
+class Solution(TrustedModel):
     """A recommended solution"""
 
+    # Solutions are cached and shared between matching calls, so they are read-only
+    model_config = ConfigDict(frozen=True)
+
     solution_id: str = Field(..., description="Unique solution ID")
     solution_name: str = Field(..., description="Solution name")
     filum_features: List[FilumFeature] = Field(
@@ -177,6 +256,9 @@ class Solution(BaseModel):
 class AlternativeApproach(BaseModel):
     """Alternative approach"""
 
+    # Built once as templates and shared between outputs
+    model_config = ConfigDict(frozen=True)
+
     approach_name: str = Field(..., description="Approach name")
     description: str = Field(..., description="Approach description")
     pros_cons: Dict[str, List[str]] = Field(
@@ -187,6 +269,8 @@ class AlternativeApproach(BaseModel):
 class NextSteps(BaseModel):
     """Next steps"""
 
+    model_config = ConfigDict(frozen=True)
+
     immediate_actions: List[str] = Field(
         default_factory=list, description="Immediate actions"
     )
@@ -198,9 +282,11 @@ class NextSteps(BaseModel):
     )
 
 
-class PainPointAnalysis(BaseModel):
+class PainPointAnalysis(TrustedModel):
     """Results analysis pain point"""
 
+    model_config = ConfigDict(frozen=True)
+
     pain_point_summary: str = Field(..., description="Problem summary")
     key_challenges: List[str] = Field(
         default_factory=list, description="Key challenges"
@@ -208,9 +294,12 @@ class PainPointAnalysis(BaseModel):
     impact_assessment: str = Field(..., description="Impact assessment")
 
 
-class AgentOutput(BaseModel):
+class AgentOutput(TrustedModel):
     """Output schema from agent"""
 
+    # Outputs are cached and shared between callers, so they are read-only
+    model_config = ConfigDict(frozen=True)
+
     analysis: PainPointAnalysis
     recommended_solutions: List[Solution]
     alternative_approaches: Optional[List[AlternativeApproach]] = Field(
@@ -225,6 +314,8 @@ class AgentOutput(BaseModel):
 class PainPointAddressed(BaseModel):
     """Pain point that feature can address"""
 
+    model_config = ConfigDict(frozen=True)
+
     pain_category: str = Field(..., description="Pain point category")
     keywords: List[str] = Field(default_factory=list, description="Related keywords")
     severity_levels: List[UrgencyLevel] = Field(
@@ -238,6 +329,8 @@ class PainPointAddressed(BaseModel):
 class FeatureCapability(BaseModel):
     """Feature capability"""
 
+    model_config = ConfigDict(frozen=True)
+
     capability_name: str = Field(..., description="Capability name")
     description: str = Field(..., description="Capability description")
     use_cases: List[str] = Field(default_factory=list, description="Use cases")
@@ -246,6 +339,8 @@ class FeatureCapability(BaseModel):
 class IntegrationOptions(BaseModel):
     """Integration options"""
 
+    model_config = ConfigDict(frozen=True)
+
     channels: List[str] = Field(default_factory=list, description="Supported channels")
     third_party_tools: List[str] = Field(
         default_factory=list, description="Third-party tools"
@@ -256,6 +351,8 @@ class IntegrationOptions(BaseModel):
 class ImplementationDetails(BaseModel):
     """Implementation details"""
 
+    model_config = ConfigDict(frozen=True)
+
     complexity: ComplexityLevel = Field(..., description="Complexity level")
     setup_time: str = Field(..., description="Setup time")
     resources_needed: List[str] = Field(
@@ -267,6 +364,8 @@ class ImplementationDetails(BaseModel):
 class FeatureBenefits(BaseModel):
     """Feature benefits"""
 
+    model_config = ConfigDict(frozen=True)
+
     quantitative: List[str] = Field(
         default_factory=list, description="Quantitative benefits"
     )
@@ -278,6 +377,8 @@ class FeatureBenefits(BaseModel):
 class SuccessStory(BaseModel):
     """Case study success"""
 
+    model_config = ConfigDict(frozen=True)
+
     industry: str = Field(..., description="Industry")
     company_size: CompanySize = Field(..., description="Scale company")
     challenge: str = Field(..., description="Challenge")
@@ -288,6 +389,8 @@ class SuccessStory(BaseModel):
 class FeatureDescription(BaseModel):
     """Detailed feature description"""
 
+    model_config = ConfigDict(frozen=True)
+
     short: str = Field(..., description="Short description")
     detailed: str = Field(..., description="Detailed description")
     technical_specs: Optional[str] = Field(None, description="Technical specifications")
@@ -296,6 +399,8 @@ class FeatureDescription(BaseModel):
 class KnowledgeBaseFeature(BaseModel):
     """Feature in knowledge base"""
 
+    model_config = ConfigDict(frozen=True)
+
     feature_id: str = Field(..., description="Unique ID")
     feature_name: str = Field(..., description="Feature name")
     category: FilumCategory = Field(..., description="Main category")
@@ -320,6 +425,8 @@ class KnowledgeBaseFeature(BaseModel):
 class PainPointCategory(BaseModel):
     """Pain point category"""
 
+    model_config = ConfigDict(frozen=True)
+
     category_name: str = Field(..., description="Category name")
     subcategories: List[str] = Field(default_factory=list, description="Subcategories")
     common_keywords: List[str] = Field(
@@ -333,12 +440,16 @@ class PainPointCategory(BaseModel):
 class PainPointTaxonomy(BaseModel):
     """Pain point classification"""
 
+    model_config = ConfigDict(frozen=True)
+
     categories: List[PainPointCategory] = Field(default_factory=list)
 
 
 class BusinessContexts(BaseModel):
     """Business contexts"""
 
+    model_config = ConfigDict(frozen=True)
+
     industries: List[str] = Field(default_factory=list, description="Industries")
     company_sizes: List[CompanySize] = Field(
         default_factory=list, description="Company sizes"
@@ -351,6 +462,9 @@ class BusinessContexts(BaseModel):
 class KnowledgeBase(BaseModel):
     """Overall knowledge base"""
 
+    # Loaded once and shared by every matching call, so it is read-only
+    model_config = ConfigDict(frozen=True)
+
     features: List[KnowledgeBaseFeature] = Field(default_factory=list)
     pain_point_taxonomy: Optional[PainPointTaxonomy] = Field(
         default_factory=PainPointTaxonomy
@@ -5,52 +5,166 @@ Helper functions for text processing, validation, etc.
 
 import re
 import json
-from typing import List, Dict, Any, Optional
+import hashlib
+from functools import lru_cache
+from typing import TYPE_CHECKING, List, Dict, Any, FrozenSet, Sequence, Tuple
 from pathlib import Path
 
-
-def normalize_text(text: str) -> str:
-    """
-    Normalize text for consistent processing
-
-    Args:
-        text: Raw text input
-
-    Returns:
-        Normalized text
-    """
-    if not text:
-        return ""
-
-    # Lowercase and remove extra whitespace
-    text = text.lower().strip()
-
-    # Remove special characters except Vietnamese accents
-    text = re.sub(
-        r"[^\w\sàáạảãâầấậẩẫăằắặẳẵèéẹẻẽêềếệểễìíịỉĩòóọỏõôồốộổỗơờớợởỡùúụủũưừứựửữỳýỵỷỹđ]",
-        " ",
-        text,
+import orjson
+
+if TYPE_CHECKING:
+    import numpy as np
+
+
+# Characters removed by normalize_text (everything except words, whitespace
+# and Vietnamese accents)
+NORMALIZE_PATTERN = re.compile(
+    r"[^\w\sàáạảãâầấậẩẫăằắặẳẵèéẹẻẽêềếệểễìíịỉĩòóọỏõôồốộổỗơờớợởỡùúụủũưừứựửữỳýỵỷỹđ]"
+)
+
+# Translation table replacing the ASCII characters NORMALIZE_PATTERN removes
+# with spaces, for the common all-ASCII text
+ASCII_NORMALIZE_TABLE = {
+    code: " " for code in range(128) if NORMALIZE_PATTERN.match(chr(code))
+}
+
+# Email format accepted by is_email_valid
+EMAIL_PATTERN = re.compile(r"^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$")
+
+# Non-digit characters stripped by clean_phone_number
+NON_DIGIT_PATTERN = re.compile(r"\D")
+
+# Entity patterns used by TextAnalyzer.extract_entities
+TOOL_PATTERNS = [
+    re.compile(
+        r"\b(CRM|ERP|API|platform|system|software|tool|application)\b", re.IGNORECASE
+    ),
+    re.compile(r"\b\w+\.com\b", re.IGNORECASE),  # URLs
+    re.compile(r"\b[A-Z][a-z]+ [A-Z][a-z]+\b", re.IGNORECASE),  # Capitalized tool names
+]
+METRIC_PATTERNS = [
+    re.compile(r"\b\d+%\b", re.IGNORECASE),  # Percentages
+    re.compile(
+        r"\b\d+\s*(hours?|minutes?|seconds?|days?|weeks?|months?)\b", re.IGNORECASE
+    ),  # Time metrics
+    re.compile(
+        r"\b\d+\s*(customers?|users?|tickets?|calls?)\b", re.IGNORECASE
+    ),  # Count metrics
+]
+DEPARTMENT_PATTERNS = [
+    re.compile(
+        r"\b(customer service|marketing|sales|support|IT|technical|operations)\b",
+        re.IGNORECASE,
     )
-
-    # Remove multiple spaces
-    text = re.sub(r"\s+", " ", text)
-
-    return text.strip()
-
-
-def extract_keywords(text: str, min_length: int = 3) -> List[str]:
-    """
-    Extract keywords from text
-
-    Args:
-        text: Input text
-        min_length: Minimum length of keyword
-
-    Returns:
-        List of unique keywords
-    """
-    # English stop words
-    stop_words = {
+]
+
+# Characteristic keywords of each industry, used by get_industry_keywords
+INDUSTRY_KEYWORDS = {
+    "e-commerce": (
+        "online",
+        "website",
+        "cart",
+        "checkout",
+        "product",
+        "order",
+        "shipping",
+    ),
+    "banking": (
+        "account",
+        "transaction",
+        "loan",
+        "credit",
+        "payment",
+        "financial",
+        "deposit",
+    ),
+    "healthcare": (
+        "patient",
+        "doctor",
+        "medical",
+        "treatment",
+        "appointment",
+        "hospital",
+        "clinic",
+    ),
+    "retail": (
+        "store",
+        "customer",
+        "purchase",
+        "sales",
+        "inventory",
+        "cashier",
+        "pos",
+    ),
+    "technology": (
+        "software",
+        "system",
+        "platform",
+        "user",
+        "feature",
+        "bug",
+        "update",
+    ),
+    "telecom": (
+        "network",
+        "call",
+        "data",
+        "mobile",
+        "internet",
+        "signal",
+        "subscriber",
+    ),
+    "insurance": (
+        "policy",
+        "claim",
+        "coverage",
+        "premium",
+        "risk",
+        "underwriting",
+        "agent",
+    ),
+}
+
+# Implementation time by complexity and company size
+IMPLEMENTATION_TIMES = {
+    "low": {
+        "startup": "1-2 weeks",
+        "small": "2-3 weeks",
+        "medium": "3-4 weeks",
+        "large": "4-6 weeks",
+        "enterprise": "6-8 weeks",
+    },
+    "medium": {
+        "startup": "3-4 weeks",
+        "small": "4-6 weeks",
+        "medium": "6-8 weeks",
+        "large": "8-12 weeks",
+        "enterprise": "12-16 weeks",
+    },
+    "high": {
+        "startup": "6-8 weeks",
+        "small": "8-12 weeks",
+        "medium": "12-16 weeks",
+        "large": "16-24 weeks",
+        "enterprise": "24-32 weeks",
+    },
+}
+
+# IMPLEMENTATION_TIMES flattened to (complexity, company_size) keys, so a
+# lookup is a single hash
+IMPLEMENTATION_TIME_BY_KEY = {
+    (complexity, company_size): time
+    for complexity, times in IMPLEMENTATION_TIMES.items()
+    for company_size, time in times.items()
+}
+
+# Accepted context values, checked by validate_pain_point_input
+VALID_COMPANY_SIZES = ["startup", "small", "medium", "large", "enterprise"]
+VALID_URGENCY_LEVELS = ["low", "medium", "high"]
+
+# English stop words skipped by extract_keywords
+STOP_WORDS = frozenset(
+    {
         # English
         "and",
         "or",
@@ -103,27 +217,139 @@ def extract_keywords(text: str, min_length: int = 3) -> List[str]:
         "might",
         "must",
     }
+)
+
+
+@lru_cache(maxsize=4096)
+def normalize_text(text: str) -> str:
+    """
+    Normalize text for consistent processing
+
+    Args:
+        text: Raw text input
+
+    Returns:
+        Normalized text
+    """
+    if not text:
+        return ""
+
+    # Lowercase
+    text = text.lower()
+
+    # Remove special characters except Vietnamese accents; ASCII text only
+    # needs a translation table, which is much cheaper than the regex
+    if text.isascii():
+        text = text.translate(ASCII_NORMALIZE_TABLE)
+    else:
+        text = NORMALIZE_PATTERN.sub(" ", text)
+
+    # Remove extra whitespace
+    return " ".join(text.split())
+
+
+def extract_keywords(text: str, min_length: int = 3) -> List[str]:
+    """
+    Extract keywords from text
+
+    Args:
+        text: Input text
+        min_length: Minimum length of keyword
+
+    Returns:
+        List of unique keywords
+    """
+    return list(_extract_keywords_cached(text, min_length))
+
+
+@lru_cache(maxsize=4096)
+def _extract_keywords_cached(text: str, min_length: int) -> Tuple[str, ...]:
+    """
+    Cached form of extract_keywords returning an immutable tuple
 
+    Args:
+        text: Input text
+        min_length: Minimum length of keyword
+
+    Returns:
+        Tuple of unique keywords
+    """
     # Normalize text
     normalized = normalize_text(text)
 
-    # Extract words
-    words = re.findall(r"\b\w+\b", normalized)
+    # Extract words; normalized text is word characters separated by single
+    # spaces, so splitting yields the same tokens as a word regex
+    words = normalized.split()
+
+    # Filter keywords, removing duplicates while preserving order
+    return tuple(
+        dict.fromkeys(
+            word
+            for word in words
+            if len(word) >= min_length and word not in STOP_WORDS
+        )
+    )
+
 
-    # Filter keywords
-    keywords = [
-        word for word in words if len(word) >= min_length and word not in stop_words
-    ]
+@lru_cache(maxsize=8192)
+def keyword_set(text: str) -> FrozenSet[str]:
+    """
+    Get the keyword set of a text, cached so static texts are tokenized once
+
+    Args:
+        text: Input text
 
-    # Remove duplicates while preserving order
-    seen = set()
-    unique_keywords = []
-    for keyword in keywords:
-        if keyword not in seen:
-            seen.add(keyword)
-            unique_keywords.append(keyword)
+    Returns:
+        Frozen set of unique keywords
+    """
+    return frozenset(_extract_keywords_cached(text, 3))
 
-    return unique_keywords
+
+def jaccard_similarity(set1: FrozenSet[str], set2: FrozenSet[str]) -> float:
+    """
+    Calculate Jaccard similarity between 2 keyword sets
+
+    Args:
+        set1, set2: Keyword sets to compare
+
+    Returns:
+        Similarity score from 0.0 to 1.0
+    """
+    if not set1 or not set2:
+        return 0.0
+
+    # Union size by inclusion-exclusion, avoiding a union set allocation
+    intersection = len(set1 & set2)
+    return intersection / (len(set1) + len(set2) - intersection)
+
+
+def jaccard_similarities(
+    keywords: FrozenSet[str], keyword_sets: Sequence[FrozenSet[str]]
+) -> "np.ndarray":
+    """
+    Calculate Jaccard similarity between a keyword set and many others at once
+
+    Args:
+        keywords: Keyword set to compare
+        keyword_sets: Keyword sets to compare against
+
+    Returns:
+        Array of similarity scores from 0.0 to 1.0, one per keyword set
+    """
+    # Imported here so validation-only callers such as the CLI don't load numpy
+    import numpy as np
+
+    count = len(keyword_sets)
+    if not keywords:
+        return np.zeros(count)
+
+    # Set intersections run in C via map; the rest is vectorized
+    intersections = np.fromiter(
+        map(len, map(keywords.intersection, keyword_sets)), np.float64, count
+    )
+    sizes = np.fromiter(map(len, keyword_sets), np.float64, count)
+
+    return intersections / (sizes + len(keywords) - intersections)
 
 
 def calculate_text_similarity(text1: str, text2: str) -> float:
@@ -139,17 +365,7 @@ def calculate_text_similarity(text1: str, text2: str) -> float:
     if not text1 or not text2:
         return 0.0
 
-    keywords1 = set(extract_keywords(text1))
-    keywords2 = set(extract_keywords(text2))
-
-    if not keywords1 or not keywords2:
-        return 0.0
-
-    # Jaccard similarity
-    intersection = keywords1.intersection(keywords2)
-    union = keywords1.union(keywords2)
-
-    return len(intersection) / len(union) if union else 0.0
+    return jaccard_similarity(keyword_set(text1), keyword_set(text2))
 
 
 def validate_pain_point_input(data: Dict[str, Any]) -> List[str]:
@@ -191,15 +407,17 @@ def validate_pain_point_input(data: Dict[str, Any]) -> List[str]:
         else:
             # Check company_size if provided
             if "company_size" in context:
-                valid_sizes = ["startup", "small", "medium", "large", "enterprise"]
-                if context["company_size"] not in valid_sizes:
-                    errors.append(f"'company_size' must be one of: {valid_sizes}")
+                if context["company_size"] not in VALID_COMPANY_SIZES:
+                    errors.append(
+                        f"'company_size' must be one of: {VALID_COMPANY_SIZES}"
+                    )
 
             # Check urgency_level if provided
             if "urgency_level" in context:
-                valid_urgency = ["low", "medium", "high"]
-                if context["urgency_level"] not in valid_urgency:
-                    errors.append(f"'urgency_level' must be one of: {valid_urgency}")
+                if context["urgency_level"] not in VALID_URGENCY_LEVELS:
+                    errors.append(
+                        f"'urgency_level' must be one of: {VALID_URGENCY_LEVELS}"
+                    )
 
     # Check affected_areas
     if "affected_areas" in pain_point:
@@ -223,17 +441,20 @@ def load_json_file(file_path: str) -> Dict[str, Any]:
         FileNotFoundError: If file doesn't exist
         json.JSONDecodeError: If JSON is invalid
     """
-    file_path = Path(file_path)
+    path = Path(file_path)
 
-    if not file_path.exists():
-        raise FileNotFoundError(f"File does not exist: {file_path}")
+    # Read the whole file as bytes in one call; a missing file surfaces here
+    # instead of costing a separate exists() check
+    try:
+        data = path.read_bytes()
+    except FileNotFoundError:
+        raise FileNotFoundError(f"File does not exist: {path}") from None
 
     try:
-        with open(file_path, "r", encoding="utf-8") as f:
-            return json.load(f)
-    except json.JSONDecodeError as e:
+        return orjson.loads(data)
+    except json.JSONDecodeError as e:  # orjson.JSONDecodeError subclasses it
         raise json.JSONDecodeError(
-            f"Invalid JSON in file {file_path}: {e}", e.doc, e.pos
+            f"Invalid JSON in file {path}: {e}", e.doc, e.pos
         )
 
 
@@ -246,12 +467,19 @@ def save_json_file(data: Dict[str, Any], file_path: str, indent: int = 2) -> Non
         file_path: Output file path
         indent: JSON indentation
     """
-    file_path = Path(file_path)
+    path = Path(file_path)
 
     # Create directory if it doesn't exist
-    file_path.parent.mkdir(parents=True, exist_ok=True)
+    path.parent.mkdir(parents=True, exist_ok=True)
 
-    with open(file_path, "w", encoding="utf-8") as f:
+    # orjson only indents by 2 spaces; other indents fall back to json
+    if indent == 2:
+        path.write_bytes(
+            orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+        )
+        return
+
+    with open(path, "w", encoding="utf-8") as f:
         json.dump(data, f, ensure_ascii=False, indent=indent)
 
 
@@ -302,13 +530,11 @@ def generate_hash_id(text: str, length: int = 8) -> str:
     Returns:
         Hash ID string
     """
-    import hashlib
-
-    # Create hash
-    hash_object = hashlib.md5(text.encode("utf-8"))
-    hash_hex = hash_object.hexdigest()
+    # Request just enough digest bytes for the hex ID (2 hex chars per byte)
+    digest_size = min(64, max(1, (length + 1) // 2))
+    hash_object = hashlib.blake2b(text.encode("utf-8"), digest_size=digest_size)
 
-    return hash_hex[:length]
+    return hash_object.hexdigest()[:length]
 
 
 def truncate_text(text: str, max_length: int = 100, suffix: str = "...") -> str:
@@ -339,8 +565,7 @@ def is_email_valid(email: str) -> bool:
     Returns:
         True if valid email format
     """
-    pattern = r"^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$"
-    return re.match(pattern, email) is not None
+    return EMAIL_PATTERN.match(email) is not None
 
 
 def clean_phone_number(phone: str) -> str:
@@ -354,7 +579,7 @@ def clean_phone_number(phone: str) -> str:
         Cleaned phone number
     """
     # Remove all non-digits
-    digits_only = re.sub(r"\D", "", phone)
+    digits_only = NON_DIGIT_PATTERN.sub("", phone)
 
     # Add country code if missing (Vietnam)
     if len(digits_only) == 10 and digits_only.startswith("0"):
@@ -375,73 +600,7 @@ def get_industry_keywords(industry: str) -> List[str]:
     Returns:
         List of keywords
     """
-    industry_keywords = {
-        "e-commerce": [
-            "online",
-            "website",
-            "cart",
-            "checkout",
-            "product",
-            "order",
-            "shipping",
-        ],
-        "banking": [
-            "account",
-            "transaction",
-            "loan",
-            "credit",
-            "payment",
-            "financial",
-            "deposit",
-        ],
-        "healthcare": [
-            "patient",
-            "doctor",
-            "medical",
-            "treatment",
-            "appointment",
-            "hospital",
-            "clinic",
-        ],
-        "retail": [
-            "store",
-            "customer",
-            "purchase",
-            "sales",
-            "inventory",
-            "cashier",
-            "pos",
-        ],
-        "technology": [
-            "software",
-            "system",
-            "platform",
-            "user",
-            "feature",
-            "bug",
-            "update",
-        ],
-        "telecom": [
-            "network",
-            "call",
-            "data",
-            "mobile",
-            "internet",
-            "signal",
-            "subscriber",
-        ],
-        "insurance": [
-            "policy",
-            "claim",
-            "coverage",
-            "premium",
-            "risk",
-            "underwriting",
-            "agent",
-        ],
-    }
-
-    return industry_keywords.get(industry.lower(), [])
+    return list(INDUSTRY_KEYWORDS.get(industry.lower(), ()))
 
 
 def estimate_implementation_time(complexity: str, company_size: str) -> str:
@@ -455,38 +614,14 @@ def estimate_implementation_time(complexity: str, company_size: str) -> str:
     Returns:
         Estimated time string
     """
-    base_times = {
-        "low": {
-            "startup": "1-2 weeks",
-            "small": "2-3 weeks",
-            "medium": "3-4 weeks",
-            "large": "4-6 weeks",
-            "enterprise": "6-8 weeks",
-        },
-        "medium": {
-            "startup": "3-4 weeks",
-            "small": "4-6 weeks",
-            "medium": "6-8 weeks",
-            "large": "8-12 weeks",
-            "enterprise": "12-16 weeks",
-        },
-        "high": {
-            "startup": "6-8 weeks",
-            "small": "8-12 weeks",
-            "medium": "12-16 weeks",
-            "large": "16-24 weeks",
-            "enterprise": "24-32 weeks",
-        },
-    }
-
-    return base_times.get(complexity, {}).get(company_size, "4-8 weeks")
+    return IMPLEMENTATION_TIME_BY_KEY.get((complexity, company_size), "4-8 weeks")
 
 
 class TextAnalyzer:
     """Class for text analysis with advanced methods"""
 
-    def __init__(self):
-        self.sentiment_keywords = {
+    def __init__(self) -> None:
+        self.sentiment_keywords: Dict[str, List[str]] = {
             "positive": [
                 "good",
                 "excellent",
@@ -510,6 +645,13 @@ class TextAnalyzer:
             "neutral": ["okay", "fine", "normal", "average", "acceptable"],
         }
 
+        # Flat keyword -> sentiment lookup used by analyze_sentiment
+        self._keyword_sentiments: Dict[str, str] = {
+            keyword: sentiment
+            for sentiment, keywords in self.sentiment_keywords.items()
+            for keyword in keywords
+        }
+
     def analyze_sentiment(self, text: str) -> Dict[str, Any]:
         """
         Basic sentiment analysis of text
@@ -522,11 +664,12 @@ class TextAnalyzer:
         """
         text_lower = text.lower()
 
-        scores = {"positive": 0, "negative": 0, "neutral": 0}
+        scores: Dict[str, int] = {"positive": 0, "negative": 0, "neutral": 0}
 
-        for sentiment, keywords in self.sentiment_keywords.items():
-            for keyword in keywords:
-                scores[sentiment] += text_lower.count(keyword)
+        # One str.count per keyword: with this few keywords, C-level substring
+        # counting beats a single pass with a combined regex alternation
+        for keyword, sentiment in self._keyword_sentiments.items():
+            scores[sentiment] += text_lower.count(keyword)
 
         total_score = sum(scores.values())
         if total_score == 0:
@@ -557,42 +700,32 @@ class TextAnalyzer:
         Returns:
             Dict with classified entities
         """
-        entities = {"tools": [], "metrics": [], "timeframes": [], "departments": []}
-
-        # Tool patterns
-        tool_patterns = [
-            r"\b(CRM|ERP|API|platform|system|software|tool|application)\b",
-            r"\b\w+\.com\b",  # URLs
-            r"\b[A-Z][a-z]+ [A-Z][a-z]+\b",  # Capitalized tool names
-        ]
-
-        # Metric patterns
-        metric_patterns = [
-            r"\b\d+%\b",  # Percentages
-            r"\b\d+\s*(hours?|minutes?|seconds?|days?|weeks?|months?)\b",  # Time metrics
-            r"\b\d+\s*(customers?|users?|tickets?|calls?)\b",  # Count metrics
-        ]
-
-        # Department patterns
-        dept_patterns = [
-            r"\b(customer service|marketing|sales|support|IT|technical|operations)\b"
-        ]
+        entities: Dict[str, List[str]] = {
+            "tools": [],
+            "metrics": [],
+            "timeframes": [],
+            "departments": [],
+        }
 
         text_lower = text.lower()
 
+        # Each pattern scans the text on its own: matches of different
+        # patterns can overlap ("10 customer service" is both a count metric
+        # and a department), and one combined scan would drop one of them
+
         # Extract tools
-        for pattern in tool_patterns:
-            matches = re.findall(pattern, text, re.IGNORECASE)
+        for pattern in TOOL_PATTERNS:
+            matches = pattern.findall(text)
             entities["tools"].extend(matches)
 
         # Extract metrics
-        for pattern in metric_patterns:
-            matches = re.findall(pattern, text_lower, re.IGNORECASE)
+        for pattern in METRIC_PATTERNS:
+            matches = pattern.findall(text_lower)
             entities["metrics"].extend(matches)
 
         # Extract departments
-        for pattern in dept_patterns:
-            matches = re.findall(pattern, text_lower, re.IGNORECASE)
+        for pattern in DEPARTMENT_PATTERNS:
+            matches = pattern.findall(text_lower)
             entities["departments"].extend(matches)
 
         # Clean duplicates
@@ -4,6 +4,10 @@ Unit tests for Pain Point Agent
 
 import pytest
 import json
+import os
+import re
+import shutil
+import numpy as np
 from pathlib import Path
 import sys
 
@@ -11,13 +15,33 @@ import sys
 sys.path.append(str(Path(__file__).parent.parent / "src"))
 
 from models import PainPointInput, UrgencyLevel, CompanySize
-from agent import PainPointAgent
-from matching import MatchingEngine
+from agent import (
+    PainPointAgent,
+    get_agent,
+    ANALYSIS_VERSION,
+    CHALLENGE_PATTERNS,
+    MAX_CHALLENGES,
+)
+from cli import (
+    _load_cached_result,
+    _result_cache_path,
+    _store_cached_result,
+    save_output_file,
+)
+from matching import (
+    MatchingEngine,
+    PAIN_SOLUTION_MAPPING,
+    CATEGORY_PATTERNS,
+)
 from utils import (
     normalize_text, 
     extract_keywords, 
     validate_pain_point_input,
-    calculate_text_similarity
+    calculate_text_similarity,
+    jaccard_similarity,
+    jaccard_similarities,
+    load_json_file,
+    save_json_file,
 )
 
 
@@ -53,7 +77,16 @@ class TestUtils:
         assert "we" not in keywords
         assert "have" not in keywords
         assert "in" not in keywords
-    
+
+    def test_extract_keywords_returns_fresh_list(self):
+        """Test cached keywords are not affected by caller mutation"""
+        text = "Support agents answer repetitive questions"
+        keywords = extract_keywords(text)
+        keywords.append("mutated")
+
+        assert "mutated" not in extract_keywords(text)
+        assert extract_keywords(text) == ["support", "agents", "answer", "repetitive", "questions"]
+
     def test_calculate_text_similarity(self):
         """Test text similarity calculation"""
         text1 = "collect customer feedback"
@@ -68,6 +101,46 @@ class TestUtils:
         
         # Empty texts
         assert calculate_text_similarity("", "anything") == 0.0
+
+    def test_jaccard_similarity(self):
+        """Test Jaccard similarity of keyword sets"""
+        assert jaccard_similarity(frozenset({"a", "b"}), frozenset({"b", "c"})) == 1 / 3
+        assert jaccard_similarity(frozenset(), frozenset({"a"})) == 0.0
+
+        keyword_sets = [frozenset({"b", "c"}), frozenset(), frozenset({"a", "b"})]
+        scores = jaccard_similarities(frozenset({"a", "b"}), keyword_sets)
+        assert scores.tolist() == [
+            jaccard_similarity(frozenset({"a", "b"}), keywords)
+            for keywords in keyword_sets
+        ]
+
+    @pytest.mark.parametrize("indent", [2, 4])
+    def test_json_file_round_trip(self, tmp_path, indent):
+        """Test saved JSON files load back unchanged and stay readable"""
+        data = {
+            "name": "Phản hồi khách hàng",
+            "scores": [0.5, 1, None, True],
+            "nested": {"tags": ["feedback", "survey"]},
+        }
+        file_path = tmp_path / "nested" / "data.json"
+
+        save_json_file(data, str(file_path), indent=indent)
+
+        assert load_json_file(str(file_path)) == data
+        text = file_path.read_text(encoding="utf-8")
+        assert json.loads(text) == data
+        assert "Phản hồi khách hàng" in text
+        assert "\n" + " " * indent + '"name"' in text
+
+    def test_load_json_file_errors(self, tmp_path):
+        """Test missing and invalid JSON files raise the documented errors"""
+        with pytest.raises(FileNotFoundError):
+            load_json_file(str(tmp_path / "missing.json"))
+
+        invalid_path = tmp_path / "invalid.json"
+        invalid_path.write_text("{not json", encoding="utf-8")
+        with pytest.raises(json.JSONDecodeError):
+            load_json_file(str(invalid_path))
     
     def test_validate_pain_point_input(self):
         """Test pain point input validation"""
@@ -135,8 +208,8 @@ class TestModels:
 class TestMatchingEngine:
     """Test MatchingEngine functionality"""
     
-    @pytest.fixture
-    def sample_knowledge_base_path(self, tmp_path):
+    @pytest.fixture(scope="session")
+    def sample_knowledge_base_path(self, tmp_path_factory):
         """Create a sample knowledge base for testing"""
         kb_data = {
             "features": [
@@ -195,7 +268,7 @@ class TestMatchingEngine:
             }
         }
         
-        kb_file = tmp_path / "test_kb.json"
+        kb_file = tmp_path_factory.mktemp("kb") / "test_kb.json"
         with open(kb_file, 'w', encoding='utf-8') as f:
             json.dump(kb_data, f)
         
@@ -230,13 +303,90 @@ class TestMatchingEngine:
         assert solutions[0].relevance_score > 0
         assert "Multi-Channel Surveys" in solutions[0].solution_name
 
+    def test_solution_cache_ignores_unrelated_fields(self, sample_knowledge_base_path):
+        """Test pain points that match the same way share cached solutions"""
+        engine = MatchingEngine(sample_knowledge_base_path)
+
+        first = PainPointInput(**{
+            "pain_point": {
+                "description": "We need to collect customer feedback via surveys",
+                "context": {"industry": "E-commerce", "company_size": "medium"},
+                "affected_areas": ["customer_service"]
+            }
+        })
+        second = PainPointInput(**{
+            "pain_point": {
+                "description": "We need to collect customer feedback via surveys",
+                "context": {"industry": "Retail", "company_size": "medium"},
+                "affected_areas": ["marketing"]
+            }
+        })
+
+        solutions = engine.find_matching_solutions(first)
+        assert engine.find_matching_solutions(second) == solutions
+        assert engine.find_matching_solutions(second)[0] is solutions[0]
+        assert engine.find_matching_solutions_batch([second])[0][0] is solutions[0]
+
+    def test_mutated_solution_does_not_leak(self, sample_knowledge_base_path):
+        """Test editing a returned solution leaves later solutions unchanged"""
+        engine = MatchingEngine(sample_knowledge_base_path)
+
+        def find_solution(description):
+            pain_point = PainPointInput(**{"pain_point": {"description": description}})
+            return engine.find_matching_solutions(pain_point)[0]
+
+        mutated = find_solution("We need to collect customer feedback via surveys")
+        expected = find_solution("Survey response rate is low").model_dump(
+            exclude={"relevance_score"}
+        )
+
+        mutated.filum_features.append(mutated.filum_features[0])
+        mutated.implementation_steps.append("MUTATED")
+        mutated.expected_outcomes.short_term.append("MUTATED")
+        mutated.expected_outcomes.long_term.append("MUTATED")
+        mutated.success_metrics.append("MUTATED")
+        mutated.related_case_studies.append("MUTATED")
+
+        solution = find_solution("Customer survey feedback is hard to collect")
+        assert solution.model_dump(exclude={"relevance_score"}) == expected
+
+    def test_match_patterns_have_no_duplicates(self):
+        """Test every pattern counts once in its pain type or category"""
+        pattern_groups = [
+            config["patterns"] for config in PAIN_SOLUTION_MAPPING.values()
+        ] + list(CATEGORY_PATTERNS.values())
+
+        for patterns in pattern_groups:
+            assert len(set(patterns)) == len(patterns)
+
+    def test_tied_scores_keep_knowledge_base_order(self):
+        """Test features with equal scores rank in knowledge base order"""
+        kb_path = str(Path(__file__).parent.parent / "data" / "knowledge_base.json")
+        engine = MatchingEngine(kb_path)
+
+        # Customer 360 and Conversation Analysis score exactly the same here,
+        # but the matrix sums differ in the last bit
+        pain_point = PainPointInput(**{
+            "pain_point": {
+                "description": "time-consuming response consolidated time volume many overload view",
+                "context": {"company_size": "medium", "urgency_level": "low"}
+            }
+        })
+        solutions = engine.find_matching_solutions(pain_point, max_solutions=6)
+        names = [solution.solution_name for solution in solutions]
+
+        customer_360 = names.index("Customer 360 Unified Profile Solution")
+        analysis = names.index("AI-Powered Conversation Analysis Solution")
+        assert analysis == customer_360 + 1
+        assert solutions[customer_360].relevance_score == solutions[analysis].relevance_score
+
 
 class TestPainPointAgent:
     """Test PainPointAgent main functionality"""
     
-    @pytest.fixture
-    def sample_agent(self, tmp_path):
-        """Create PainPointAgent with sample knowledge base"""
+    @pytest.fixture(scope="session")
+    def sample_agent_knowledge_base_path(self, tmp_path_factory):
+        """Create minimal knowledge base shared by agent tests"""
         # Create minimal knowledge base
         kb_data = {
             "features": [
@@ -286,11 +436,18 @@ class TestPainPointAgent:
             }
         }
         
-        kb_file = tmp_path / "test_kb.json"
+        kb_file = tmp_path_factory.mktemp("agent_kb") / "test_kb.json"
         with open(kb_file, 'w', encoding='utf-8') as f:
             json.dump(kb_data, f)
         
-        return PainPointAgent(str(kb_file))
+        return str(kb_file)
+
+    @pytest.fixture
+    def sample_agent(self, sample_agent_knowledge_base_path):
+        """Create PainPointAgent with sample knowledge base"""
+        # Agents for the same path share one loaded MatchingEngine, while
+        # each test still gets its own result caches and settings
+        return PainPointAgent(sample_agent_knowledge_base_path)
     
     def test_agent_initialization(self, sample_agent):
         """Test agent initialization"""
@@ -326,6 +483,62 @@ class TestPainPointAgent:
         assert result.next_steps is not None
         assert len(result.next_steps.immediate_actions) > 0
     
+    def test_analyze_batch_matches_single_analysis(self, sample_agent):
+        """Test analyze_batch returns same results as analyze_and_recommend"""
+        inputs = [
+            {"pain_point": {"description": "We have trouble collecting customer feedback"}},
+            {"pain_point": {"description": "Support agents are overloaded with tickets"}},
+        ]
+
+        batch_results = sample_agent.analyze_batch(inputs)
+
+        assert len(batch_results) == len(inputs)
+        for pain_point_data, batch_result in zip(inputs, batch_results):
+            single_result = sample_agent.analyze_and_recommend(pain_point_data)
+            assert batch_result.model_dump() == single_result.model_dump()
+
+    def test_key_challenges_match_per_pattern_search(self, sample_agent):
+        """Test the fused challenge regex finds the same challenges, in order,
+        as searching each pattern separately"""
+        alternatives = [
+            alternative
+            for pattern, _ in CHALLENGE_PATTERNS
+            for alternative in pattern.split("|")
+        ]
+        # Every pair of pattern words, apart and run together, plus sentences
+        # where matches of different challenges overlap ("slow rate" holds
+        # both "slow" and "low rate")
+        descriptions = [
+            f"{first}{separator}{second}"
+            for first in alternatives
+            for second in alternatives
+            for separator in (" ", "")
+        ] + [
+            "Replies are slow rate of resolution is poor",
+            "We struggle with too much manual, time-consuming work and no idea why "
+            "results are inconsistent, slow and inefficient",
+        ]
+        area_challenges = [
+            "Need to improve customer service quality",
+            "Need to optimize marketing effectiveness",
+        ]
+
+        for description in descriptions:
+            pain_point = PainPointInput(**{
+                "pain_point": {
+                    "description": description,
+                    "affected_areas": ["customer_service", "marketing"]
+                }
+            })
+            expected = [
+                challenge
+                for pattern, challenge in CHALLENGE_PATTERNS
+                if re.search(pattern, description.lower())
+            ]
+            expected = (expected + area_challenges)[:MAX_CHALLENGES]
+
+            assert sample_agent._extract_key_challenges(pain_point) == expected
+
     def test_list_available_features(self, sample_agent):
         """Test listing available features"""
         features = sample_agent.list_available_features()
@@ -342,6 +555,167 @@ class TestPainPointAgent:
         non_existent = sample_agent.get_feature_details("non_existent")
         assert non_existent is None
 
+    def test_exact_cache_reuses_identical_input(self, sample_agent):
+        """Test identical input returns cached result"""
+        pain_point_data = {
+            "pain_point": {
+                "description": "We have trouble collecting customer feedback effectively"
+            }
+        }
+
+        first = sample_agent.analyze_and_recommend(pain_point_data)
+
+        assert sample_agent.analyze_and_recommend(dict(pain_point_data)) is first
+        assert sample_agent.analyze_and_recommend(PainPointInput(**pain_point_data)) is first
+        assert sample_agent.analyze_and_recommend(pain_point_data, max_solutions=1) is not first
+
+    def test_semantic_cache_reuses_near_duplicate(self, sample_agent):
+        """Test semantic cache returns result for reworded description"""
+        sample_agent.semantic_cache_threshold = 0.8
+        context = {"industry": "E-commerce", "company_size": "medium"}
+
+        first = sample_agent.analyze_and_recommend({
+            "pain_point": {
+                "description": "We have trouble collecting customer feedback effectively",
+                "context": context
+            }
+        })
+        reworded = sample_agent.analyze_and_recommend({
+            "pain_point": {
+                "description": "We have trouble effectively collecting customer feedback",
+                "context": context
+            }
+        })
+        other_context = sample_agent.analyze_and_recommend({
+            "pain_point": {
+                "description": "We have trouble collecting customer feedback effectively",
+                "context": {"industry": "Retail", "company_size": "medium"}
+            }
+        })
+
+        assert reworded is first
+        assert other_context is not first
+
+    def test_semantic_cache_with_embedder(self):
+        """Test semantic cache compares descriptions by embedding when given an embedder"""
+        vocabulary = ("feedback", "slow", "support")
+
+        def embedder(text):
+            return np.array([float(word in text.lower()) for word in vocabulary])
+
+        agent = PainPointAgent(embedder=embedder)
+        assert agent.semantic_cache_threshold == 0.95
+
+        first = agent.analyze_and_recommend(
+            {"pain_point": {"description": "Customer feedback is hard to collect"}}
+        )
+        reworded = agent.analyze_and_recommend(
+            {"pain_point": {"description": "Collecting feedback from customers is hard"}}
+        )
+        different = agent.analyze_and_recommend(
+            {"pain_point": {"description": "Support replies are slow"}}
+        )
+
+        assert reworded is first
+        assert different is not first
+
+    def test_get_agent_is_cached(self):
+        """Test get_agent reuses the agent for the same knowledge base"""
+        kb_path = str(Path(__file__).parent.parent / "data" / "knowledge_base.json")
+
+        assert get_agent(kb_path) is get_agent(kb_path)
+
+    def test_agents_share_matching_engine(self):
+        """Test agents for the same knowledge base load it only once"""
+        kb_path = str(Path(__file__).parent.parent / "data" / "knowledge_base.json")
+        first = PainPointAgent(kb_path)
+        second = PainPointAgent(kb_path)
+
+        assert first is not second
+        assert first.matching_engine is second.matching_engine
+
+
+class TestResultCache:
+    """Test the on-disk result cache of the CLI analyze command"""
+
+    @pytest.fixture
+    def cache_home(self, tmp_path, monkeypatch):
+        """Point the result cache at a temporary directory"""
+        cache_home = tmp_path / "cache"
+        monkeypatch.setenv("XDG_CACHE_HOME", str(cache_home))
+        return cache_home
+
+    @pytest.fixture
+    def knowledge_base_path(self, tmp_path):
+        """Copy the real knowledge base so tests can change its mtime"""
+        kb_file = tmp_path / "knowledge_base.json"
+        shutil.copy(Path(__file__).parent.parent / "data" / "knowledge_base.json", kb_file)
+        return str(kb_file)
+
+    def test_cache_miss_then_hit(self, cache_home, knowledge_base_path):
+        """Test a stored result is found again for the same input"""
+        pain_point_data = {
+            "pain_point": {"description": "We have trouble collecting customer feedback"}
+        }
+        cache_path = _result_cache_path(pain_point_data, 3, knowledge_base_path)
+
+        assert cache_path.parent == cache_home / "filum-agent"
+        assert _load_cached_result(cache_path) is None
+
+        agent = PainPointAgent(knowledge_base_path)
+        result = agent.analyze_and_recommend(pain_point_data, 3)
+        _store_cached_result(cache_path, result)
+
+        assert _result_cache_path(pain_point_data, 3, knowledge_base_path) == cache_path
+        cached = _load_cached_result(cache_path)
+        assert cached is not None
+        assert cached.model_dump() == result.model_dump()
+
+    def test_cache_key_invalidation(self, cache_home, knowledge_base_path, monkeypatch):
+        """Test input, knowledge base and analysis version changes miss the cache"""
+        pain_point_data = {
+            "pain_point": {"description": "We have trouble collecting customer feedback"}
+        }
+        cache_path = _result_cache_path(pain_point_data, 3, knowledge_base_path)
+
+        other_input = {"pain_point": {"description": "Support agents are overloaded"}}
+        assert _result_cache_path(other_input, 3, knowledge_base_path) != cache_path
+        assert _result_cache_path(pain_point_data, 2, knowledge_base_path) != cache_path
+
+        # Editing the knowledge base changes its modification time
+        stat = os.stat(knowledge_base_path)
+        os.utime(
+            knowledge_base_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9)
+        )
+        edited_path = _result_cache_path(pain_point_data, 3, knowledge_base_path)
+        assert edited_path != cache_path
+
+        # Results of older analysis logic are not reused after an upgrade
+        monkeypatch.setattr("agent.ANALYSIS_VERSION", ANALYSIS_VERSION + 1)
+        assert _result_cache_path(pain_point_data, 3, knowledge_base_path) != edited_path
+
+    def test_markdown_output_loads_no_agent(
+        self, knowledge_base_path, tmp_path, monkeypatch
+    ):
+        """Test a result is saved as markdown without loading another agent"""
+        pain_point_data = {
+            "pain_point": {"description": "We have trouble collecting customer feedback"}
+        }
+        result = PainPointAgent(knowledge_base_path).analyze_and_recommend(
+            pain_point_data, 3
+        )
+
+        def fail_get_agent(knowledge_base_path=None):
+            raise AssertionError("saving output must not load an agent")
+
+        monkeypatch.setattr("agent.get_agent", fail_get_agent)
+        output_path = tmp_path / "report.md"
+        save_output_file(result, str(output_path))
+
+        report = output_path.read_text(encoding="utf-8")
+        assert report.startswith("# Pain Point Analysis Report")
+        assert result.recommended_solutions[0].solution_name in report
+
 
 class TestIntegration:
     """Integration tests for entire workflow"""
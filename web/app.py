@@ -9,28 +9,62 @@ Author: Filum.ai Development Team
 """
 
 from fastapi import FastAPI, Request, Form, HTTPException
-from fastapi.responses import HTMLResponse, JSONResponse
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import HTMLResponse, JSONResponse, Response
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
-from typing import Optional, List, Dict, Any
-import json
+from typing import Optional, Dict, Any
+from contextlib import asynccontextmanager
+import logging
+import orjson
 import sys
-import os
 from pathlib import Path
-from fastapi import Request
 # Add src to path to import modules from core agent
 current_dir = Path(__file__).parent
 project_root = current_dir.parent
 sys.path.insert(0, str(project_root / "src"))
 
-from models import PainPointInput
-from agent import PainPointAgent
+logger = logging.getLogger(__name__)
+
+class ORJSONResponse(JSONResponse):
+    """JSON response encoded with orjson
+
+    Defined here rather than imported, since newer FastAPI releases
+    deprecate fastapi.responses.ORJSONResponse.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+
+def initialize_agent(app: FastAPI):
+    """Initialize agent with knowledge base"""
+    try:
+        # Imported here so the agent's dependencies (matching engine,
+        # numpy) load with the knowledge base, not when the app is imported
+        from agent import get_agent
+        app.state.agent = get_agent()
+        return True
+    except Exception as e:
+        logger.exception("Error initializing agent: %s", e)
+        return False
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Initialize agent when starting server"""
+    app.state.agent = None
+    # Loading the knowledge base is blocking work, so run it off the event loop
+    success = await run_in_threadpool(initialize_agent, app)
+    if not success:
+        logger.warning("Failed to initialize agent")
+    yield
 
 # Initialize FastAPI app
 app = FastAPI(
     title="Filum.ai Pain Point to Solution Agent",
     description="AI Agent that analyzes customer pain points and recommends solutions from Filum.ai platform",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan
 )
 
 # Mount static files
@@ -39,26 +73,32 @@ app.mount("/static", StaticFiles(directory=str(current_dir / "static")), name="s
 # Setup templates
 templates = Jinja2Templates(directory=str(current_dir / "templates"))
 
-# Initialize agent
-agent = None
+def _solution_to_dict(sol) -> Dict[str, Any]:
+    """Convert a recommended Solution to the response format of /analyze"""
+    # Solutions are typed models, so fields are read directly; optional
+    # fields fall back to the same defaults as before
+    features = sol.filum_features
+    expected_outcomes = sol.expected_outcomes
+    resource_requirements = sol.resource_requirements
 
-def initialize_agent():
-    """Initialize agent with knowledge base"""
-    global agent
-    try:
-        agent = PainPointAgent()
-        return True
-    except Exception as e:
-        print(f"Error initializing agent: {e}")
-        return False
-
-# Initialize on startup
-@app.on_event("startup")
-async def startup_event():
-    """Initialize agent when starting server"""
-    success = initialize_agent()
-    if not success:
-        print("Warning: Failed to initialize agent")
+    return {
+        "solution_id": sol.solution_id,
+        "name": sol.solution_name,
+        "category": features[0].feature_category.value if features else "general",
+        "description": sol.how_it_helps,
+        "confidence_score": sol.relevance_score,
+        "implementation_effort": sol.complexity_level.value,
+        "expected_impact": (
+            expected_outcomes.short_term[0]
+            if expected_outcomes and expected_outcomes.short_term
+            else "Improve efficiency"
+        ),
+        "key_features": [feature.feature_name for feature in features],
+        "use_cases": [],
+        "requirements": (
+            resource_requirements and resource_requirements.technical
+        ) or "Detailed evaluation needed",
+    }
 
 @app.get("/", response_class=HTMLResponse)
 async def home(request: Request):
@@ -66,16 +106,17 @@ async def home(request: Request):
     return templates.TemplateResponse("index.html", {"request": request})
 
 @app.get("/health")
-async def health_check():
+async def health_check(request: Request):
     """Health check endpoint"""
     return {
         "status": "healthy",
-        "agent_initialized": agent is not None,
+        "agent_initialized": request.app.state.agent is not None,
         "version": "1.0.0"
     }
 
 @app.post("/analyze")
 async def analyze_pain_point(
+    request: Request,
     pain_point: str = Form(...),
     context: Optional[str] = Form(None),
     industry: Optional[str] = Form(None),
@@ -98,11 +139,11 @@ async def analyze_pain_point(
         JSON response với results analysis
     """
     
-    print(f"🔍 Starting analysis pain point...")
-    print(f"📝 Pain point: {pain_point}")
-    print(f"📋 Context: {context}")
-    print(f"🏢 Industry: {industry}, Company size: {company_size}")
+    logger.debug("Starting analysis pain point: %s", pain_point)
+    logger.debug("Context: %s", context)
+    logger.debug("Industry: %s, Company size: %s", industry, company_size)
     
+    agent = request.app.state.agent
     if not agent:
         raise HTTPException(status_code=500, detail="Agent not initialized")
     
@@ -129,68 +170,23 @@ async def analyze_pain_point(
         
         # Safe conversion with error handling
         try:
-            recommended_solutions = []
-            for sol in result.recommended_solutions:
-                solution_dict = {
-                    "solution_id": getattr(sol, 'solution_id', 'unknown'),
-                    "name": getattr(sol, 'solution_name', 'Unknown Solution'),
-                    "category": "general",
-                    "description": getattr(sol, 'how_it_helps', 'Solution recommended to solve your problem'),
-                    "confidence_score": getattr(sol, 'relevance_score', 0.5),
-                    "implementation_effort": "medium",
-                    "expected_impact": "Improve efficiency",
-                    "key_features": [],
-                    "use_cases": [],
-                    "requirements": "Detailed evaluation needed"
-                }
-                
-                # Safe access to nested attributes with enum handling
-                if hasattr(sol, 'filum_features') and sol.filum_features:
-                    if sol.filum_features:
-                        feature_category = getattr(sol.filum_features[0], 'feature_category', 'general')
-                        # Convert enum to string if necessary
-                        if hasattr(feature_category, 'value'):
-                            solution_dict["category"] = feature_category.value
-                        else:
-                            solution_dict["category"] = str(feature_category)
-                        solution_dict["key_features"] = [getattr(f, 'feature_name', 'Unknown') for f in sol.filum_features]
-                
-                # Convert implementation_effort enum to string
-                impl_effort = getattr(sol, 'complexity_level', 'medium')
-                if hasattr(impl_effort, 'value'):
-                    solution_dict["implementation_effort"] = impl_effort.value
-                else:
-                    solution_dict["implementation_effort"] = str(impl_effort)
-                
-                if hasattr(sol, 'expected_outcomes') and sol.expected_outcomes:
-                    if hasattr(sol.expected_outcomes, 'short_term') and sol.expected_outcomes.short_term:
-                        solution_dict["expected_impact"] = sol.expected_outcomes.short_term[0]
-                
-                if hasattr(sol, 'use_case') and sol.use_case:
-                    solution_dict["use_cases"] = [sol.use_case]
-                    
-                if hasattr(sol, 'resource_requirements') and sol.resource_requirements:
-                    if hasattr(sol.resource_requirements, 'technical') and sol.resource_requirements.technical:
-                        solution_dict["requirements"] = sol.resource_requirements.technical
-                
-                recommended_solutions.append(solution_dict)
+            recommended_solutions = [
+                _solution_to_dict(sol) for sol in result.recommended_solutions
+            ]
             
             # Convert result to dict for JSON response
             result_dict = {
-                "pain_point_summary": getattr(result.analysis, 'pain_point_summary', 'Pain point analyzed successfully'),
+                "pain_point_summary": result.analysis.pain_point_summary,
                 "recommended_solutions": recommended_solutions,
                 "confidence_score": 0.8,  # Default confidence score
-                "reasoning": getattr(result.analysis, 'impact_assessment', 'Analysis completed successfullyfully'),
-                "next_steps": []
+                "reasoning": result.analysis.impact_assessment,
+                "next_steps": (
+                    result.next_steps.immediate_actions if result.next_steps else []
+                )
             }
-            
-            # Safe access to next_steps
-            if hasattr(result, 'next_steps') and result.next_steps:
-                if hasattr(result.next_steps, 'immediate_actions') and result.next_steps.immediate_actions:
-                    result_dict["next_steps"] = result.next_steps.immediate_actions
                     
         except Exception as conversion_error:
-            print(f"Error converting result: {conversion_error}")
+            logger.warning("Error converting result: %s", conversion_error)
             # Fallback response
             result_dict = {
                 "pain_point_summary": "Completed pain point analysis",
@@ -213,36 +209,35 @@ async def analyze_pain_point(
                 "next_steps": ["Contact Filum.ai team", "Evaluate detailed requirements", "Plan implementation"]
             }
         
-        return JSONResponse(content=result_dict)
+        return ORJSONResponse(content=result_dict)
         
     except Exception as e:
-        print(f"🚨 Analysis error: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("Analysis error: %s", e)
         raise HTTPException(status_code=500, detail=f"Analysis failed: {str(e)}")
-    
-    finally:
-        print(f"📤 Returning response: {result_dict if 'result_dict' in locals() else 'No result'}")
-        
-    print(f"✅ Analysis completed, trả về result_dict với {len(result_dict.get('recommended_solutions', []))} solutions")
 
 
 
 @app.post("/api/analyze")
 async def api_analyze_pain_point(request: Request):
+    agent = request.app.state.agent
     if not agent:
         raise HTTPException(status_code=500, detail="Agent not initialized")
     try:
         data = await request.json()
         result = agent.analyze_and_recommend(data, max_solutions=3)
-        return result
+        # Serialize the model straight to JSON bytes in pydantic-core,
+        # skipping FastAPI's jsonable_encoder walk
+        return Response(
+            content=result.model_dump_json(), media_type="application/json"
+        )
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Analysis failed: {str(e)}")
 
 @app.get("/solutions")
-async def get_all_solutions():
+async def get_all_solutions(request: Request):
     """Lấy danh sách tất cả solution trong knowledge base"""
     
+    agent = request.app.state.agent
     if not agent:
         raise HTTPException(status_code=500, detail="Agent not initialized")
     
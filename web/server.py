@@ -14,34 +14,12 @@ Example:
 
 import sys
 import argparse
-import os
 from pathlib import Path
 
 # Add project root to Python path
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
-def check_dependencies():
-    """Kiểm tra các dependencies cần thiết"""
-    required_packages = [
-        'fastapi', 'uvicorn', 'jinja2', 'python-multipart'
-    ]
-    
-    missing_packages = []
-    for package in required_packages:
-        try:
-            __import__(package.replace('-', '_'))
-        except ImportError:
-            missing_packages.append(package)
-    
-    if missing_packages:
-        print(f"❌ Missing required packages: {', '.join(missing_packages)}")
-        print(f"Please install them using:")
-        print(f"pip install {' '.join(missing_packages)}")
-        return False
-    
-    return True
-
 def check_knowledge_base():
     """Kiểm tra knowledge base file"""
     kb_path = project_root / "data" / "knowledge_base.json"
@@ -85,10 +63,6 @@ def main():
     print("🚀 Starting Filum.ai Pain Point to Solution Agent Web Server...")
     print(f"📁 Project root: {project_root}")
     
-    # Check dependencies
-    if not check_dependencies():
-        sys.exit(1)
-    
     # Check knowledge base
     if not check_knowledge_base():
         sys.exit(1)
@@ -114,6 +88,7 @@ def main():
         )
         
     except ImportError as e:
+        # Missing dependencies surface here, from the real imports above
         print(f"❌ Import error: {e}")
         print("Please make sure all dependencies are installed:")
         print("pip install -r requirements.txt")